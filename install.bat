@@ -31,6 +31,10 @@ python3 -m venv .venv
 .venv\Scripts\activate
 :: Install deps
 pip install -r requirements.txt
+:: Compile map packs
+pushd src
+python -m map.pack ..\assets\maps\ramparts
+popd
 :: Package
 pip install -U pyinstaller
 pyinstaller --noconfirm main.spec
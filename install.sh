@@ -20,6 +20,8 @@ python3 -m venv .venv
 . .venv/bin/activate
 # Install deps
 pip install -r requirements.txt
+# Compile map packs
+(cd src && python -m map.pack ../assets/maps/ramparts)
 # Package
 pip install -U pyinstaller
 pyinstaller --noconfirm main.spec
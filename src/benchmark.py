@@ -0,0 +1,405 @@
+import os
+import random
+from argparse import ArgumentParser
+from collections.abc import Callable
+from timeit import Timer
+
+import pygame
+from util.type import Blit, Drawable
+
+type Variants = dict[str, Callable[[], None]]
+
+WINDOW_SIZE: tuple[int, int] = 1280, 720
+
+BENCHMARKS: dict[str, Callable[[], Variants]] = {}
+
+
+def benchmark(fn: Callable[[], Variants]) -> Callable[[], Variants]:
+    """Registers the given benchmark. A benchmark sets up its workload and returns the variants to time."""
+
+    BENCHMARKS[fn.__name__.removeprefix("bench_")] = fn
+    return fn
+
+
+class _Sprite(Drawable):
+    def __init__(self, surface: pygame.Surface, x: float, y: float):
+        self.surface: pygame.Surface = surface
+        self.x: float = x
+        self.y: float = y
+
+    def get_blits(self, x_off: float, y_off: float) -> list[Blit]:
+        return [(self.surface, (self.x + x_off, self.y + y_off))]
+
+    def draw(self, surface: pygame.Surface, x_off: float, y_off: float) -> None:
+        surface.blit(self.surface, (self.x + x_off, self.y + y_off))
+
+
+class _PropertyBox:
+    """The previous property based Box, for comparison."""
+
+    @property
+    def x(self) -> float:
+        return self.left
+
+    @property
+    def y(self) -> float:
+        return self.top
+
+    @property
+    def left(self) -> float:
+        return self._left
+
+    @property
+    def top(self) -> float:
+        return self._top
+
+    @property
+    def right(self) -> float:
+        return self.left + self.width
+
+    @property
+    def bottom(self) -> float:
+        return self.top + self.height
+
+    @property
+    def width(self) -> int:
+        return self._width
+
+    @property
+    def height(self) -> int:
+        return self._height
+
+    def __init__(self, x: float, y: float, width: int, height: int):
+        self._left = x
+        self._top = y
+        self._width = width
+        self._height = height
+
+    def __iter__(self):
+        return iter((self.x, self.y, self.width, self.height))
+
+
+@benchmark
+def bench_box() -> Variants:
+    """Reading the edges of and unpacking 1000 boxes, property based vs slotted."""
+
+    from box import Box
+
+    rects = [(random.uniform(0, 5000), random.uniform(0, 2000), random.randint(1, 200), 40) for _ in range(1000)]
+    prop_boxes = [_PropertyBox(*rect) for rect in rects]
+    boxes = [Box(*rect) for rect in rects]
+
+    def property_edges() -> None:
+        for box in prop_boxes:
+            box.left, box.top, box.right, box.bottom
+
+    def slotted_edges() -> None:
+        for box in boxes:
+            box.left, box.top, box.right, box.bottom
+
+    def slotted_plain() -> None:
+        for box in boxes:
+            x = box.x
+            y = box.y
+            x, y, x + box.width, y + box.height
+
+    def property_unpack() -> None:
+        for box in prop_boxes:
+            (*box,)
+
+    def slotted_unpack() -> None:
+        for box in boxes:
+            (*box,)
+
+    return {
+        "property edges": property_edges,
+        "slotted edges": slotted_edges,
+        "slotted plain attributes": slotted_plain,
+        "property unpack": property_unpack,
+        "slotted unpack": slotted_unpack,
+    }
+
+
+@benchmark
+def bench_collision() -> Variants:
+    """A hitbox against 1000 boxes with the previous property based checks vs the slotted ones."""
+
+    from box import Hitbox
+
+    rects = [(random.uniform(0, 2000), random.uniform(0, 2000), random.randint(1, 200), 40) for _ in range(1000)]
+    prop_boxes = [_PropertyBox(*rect) for rect in rects]
+    old_hitbox = _PropertyBox(1000, 1000, 50, 80)
+    boxes = [Hitbox(*rect) for rect in rects]
+    hitbox = Hitbox(1000, 1000, 50, 80)
+
+    def prop_detect(left: float, top: float, right: float, bottom: float) -> bool:
+        box = old_hitbox
+        return box.left < right and box.right > left and box.top < bottom and box.bottom > top
+
+    def property_check() -> None:
+        for box in prop_boxes:
+            prop_detect(box.left, box.top, box.right, box.bottom)
+
+    def slotted_check() -> None:
+        for box in boxes:
+            hitbox.detect_collision_box(box)
+
+    return {"property": property_check, "slotted": slotted_check}
+
+
+@benchmark
+def bench_sprites() -> Variants:
+    """500 on-screen 64x64 sprites drawn individually vs batched like the camera does, and batched at half scale."""
+
+    from camera import Camera
+
+    camera = Camera()
+    window = pygame.display.get_surface()
+    frames = []
+    for _ in range(8):
+        frame = pygame.Surface((64, 64), pygame.SRCALPHA).convert_alpha()
+        frame.fill((random.randrange(256), random.randrange(256), random.randrange(256), 200))
+        frames.append(frame)
+    sprites = [
+        _Sprite(random.choice(frames), random.uniform(0, WINDOW_SIZE[0] - 64), random.uniform(0, WINDOW_SIZE[1] - 64))
+        for _ in range(500)
+    ]
+
+    def individual() -> None:
+        for sprite in sprites:
+            sprite.draw(window, -10, -10)
+
+    def batched() -> None:
+        camera._render_batched(sprites, window, -10, -10)
+
+    def batched_half_scale() -> None:
+        camera._render_batched(sprites, window, -10, -10, 0.5)
+
+    return {"individual": individual, "batched": batched, "batched_half_scale": batched_half_scale}
+
+
+@benchmark
+def bench_level_texture() -> Variants:
+    """A viewport of a mostly empty or opaque level texture drawn as one alpha blit vs split by transparency."""
+
+    from map.texture import SplitTexture
+
+    window = pygame.display.get_surface()
+    texture = pygame.Surface((4096, 2048), pygame.SRCALPHA).convert_alpha()
+    # Opaque ground and platforms with translucent decorations, the rest is transparent to show the background
+    texture.fill((90, 70, 50), (0, 1400, 4096, 648))
+    for _ in range(40):
+        texture.fill((90, 70, 50), (random.randrange(4096), random.randrange(1400), random.randint(100, 600), 40))
+    for _ in range(20):
+        pos = random.randrange(4096), random.randint(1300, 1500)
+        pygame.draw.circle(texture, (60, 140, 60, random.randint(40, 200)), pos, random.randint(10, 60))
+    split = SplitTexture(texture)
+    viewport = 1000, 900, *WINDOW_SIZE
+
+    def single() -> None:
+        window.blit(texture, (0, 0), viewport)
+
+    def split_texture() -> None:
+        split.draw(window, *viewport)
+
+    return {"single": single, "split": split_texture}
+
+
+def _grid_map(width: int, height: int, cell_size: int):
+    """Creates an empty map with only its broadphase and physics world, skipping loading segments and textures."""
+
+    from collections import OrderedDict
+
+    from map import Map
+    from map.broadphase import SpatialGrid
+    from map.physics import PhysicsWorld
+    from util.type import Layer
+
+    grid_map = Map.__new__(Map)
+    grid_map.width = width
+    grid_map.height = height
+    grid_map.cell_size = cell_size
+    grid_map.broadphase = SpatialGrid(width, height, cell_size)
+    grid_map.objects = set()
+    grid_map.generations = {layer.value: 0 for layer in Layer}
+    grid_map.query_cache = OrderedDict()
+    grid_map.query_hits = grid_map.query_misses = 0
+    grid_map.physics = PhysicsWorld(Map.GRAVITY, Map.AIR_RESISTANCE)
+    return grid_map
+
+
+@benchmark
+def bench_query_cache() -> Variants:
+    """100 wall queries repeated every frame while 100 enemies move, without vs with the map's query cache."""
+
+    from box import Box
+    from map import Wall
+    from util.type import Layer
+
+    class Mover(Box):
+        LAYER: Layer = Layer.ENEMY
+
+    grid_map = _grid_map(8000, 2000, 200)
+    for _ in range(1000):
+        grid_map.add(Wall(random.uniform(0, 8000), random.uniform(0, 2000), random.randint(50, 400), 40))
+    movers = [Mover(random.uniform(0, 8000), random.uniform(0, 2000), 40, 60) for _ in range(100)]
+    for mover in movers:
+        grid_map.add(mover)
+    # Like idle enemies' sense areas, which stay the same while the enemies stand still
+    areas = [(random.uniform(0, 8000), random.uniform(0, 2000), 400, 200) for _ in range(100)]
+
+    def frame(cached: bool) -> None:
+        for mover in movers:
+            grid_map._remove(mover, False)
+            mover.x += 1
+            grid_map._add(mover, False)
+        for area in areas:
+            grid_map.get_rect(*area, layers=Layer.WALL, cached=cached)
+
+    def uncached() -> None:
+        frame(False)
+
+    def cached() -> None:
+        frame(True)
+
+    return {"uncached": uncached, "cached": cached}
+
+
+@benchmark
+def bench_rect_exists() -> Variants:
+    """Checking 100 crowded rects for any wall by collecting them vs stopping at the first."""
+
+    from map import Wall
+    from util.type import Layer
+
+    grid_map = _grid_map(8000, 2000, 200)
+    for _ in range(3000):
+        grid_map.add(Wall(random.uniform(0, 8000), random.uniform(0, 2000), random.randint(50, 400), 40))
+    areas = [(random.uniform(0, 8000), random.uniform(0, 2000), 400, 200) for _ in range(100)]
+
+    def collect() -> None:
+        for area in areas:
+            bool(grid_map.get_rect(*area, layers=Layer.WALL))
+
+    def any_in_rect() -> None:
+        for area in areas:
+            grid_map.any_in_rect(*area, layers=Layer.WALL)
+
+    return {"get_rect": collect, "any_in_rect": any_in_rect}
+
+
+@benchmark
+def bench_physics_step() -> Variants:
+    """Applying gravity and air resistance to 2000 loot drops, per body vs in one array step."""
+
+    from box import Box
+    from map import Map
+    from map.physics import Body, PhysicsWorld
+
+    class Drop(Box, Body):
+        pass
+
+    class Loose(Box):
+        vx: float
+        vy: float
+
+    world = PhysicsWorld(Map.GRAVITY, Map.AIR_RESISTANCE)
+    drops = []
+    for _ in range(2000):
+        drop = Drop(0, 0, 24, 24)
+        drop.vx = random.uniform(-80, 80)
+        drop.vy = -random.uniform(100, 400)
+        drops.append(drop)
+    # Plain attributes, like before the physics world
+    loose = [Loose(0, 0, 24, 24) for _ in drops]
+    for box, drop in zip(loose, drops):
+        box.vx = drop.vx
+        box.vy = drop.vy
+    for drop in drops:
+        world.add(drop)
+    dt = 1 / 60
+
+    def per_body() -> None:
+        for drop in loose:
+            drop.vx -= Map.get_air_resistance(drop.vx, drop.height) * dt
+            drop.vy += (Map.GRAVITY - Map.get_air_resistance(drop.vy, drop.width)) * dt
+
+    def array_step() -> None:
+        world.step(dt, drops)
+
+    return {"per body": per_body, "physics world": array_step}
+
+
+@benchmark
+def bench_resting_bodies() -> Variants:
+    """Ticking 1000 loot drops lying on the floor, all awake vs all asleep."""
+
+    from box import Hitbox
+    from map import Wall
+    from map.physics import Body
+    from util.type import Direction, Layer
+
+    class Drop(Hitbox, Body):
+        LAYER: Layer = Layer.PICKUP
+
+    grid_map = _grid_map(8000, 1000, 200)
+    for x in range(0, 8000, 1600):
+        grid_map.add(Wall(x, 900, 1600, 100))
+    drops = [Drop(random.uniform(0, 7976), 876, 24, 24) for _ in range(1000)]
+    for drop in drops:
+        drop.on_platform = True
+        grid_map.add(drop)
+    dt = 1 / 60
+
+    def tick(asleep: bool) -> Callable[[], None]:
+        def run() -> None:
+            for drop in drops:
+                if asleep:
+                    drop.sleep()
+                else:
+                    drop.wake()
+            grid_map.physics.step(dt, drops)
+            for drop in drops:
+                if drop.asleep:
+                    continue
+                grid_map._remove(drop, False)
+                dy = drop.vy * dt
+                walls = grid_map.get_rect(drop.x, drop.y, drop.width, drop.height + dy, layers=Layer.WALL)
+                for direction, _ in drop.move(0, dy, walls):
+                    if direction is Direction.DOWN:
+                        drop.vy = 0
+                grid_map._add(drop, False)
+
+        return run
+
+    return {"awake": tick(False), "asleep": tick(True)}
+
+
+def main():
+    parser = ArgumentParser(description="Runs micro benchmarks of hot paths.")
+    parser.add_argument("names", nargs="*", help=f"benchmarks to run (default all): {', '.join(BENCHMARKS)}")
+    parser.add_argument("-n", "--number", type=int, default=100, help="calls per repeat")
+    parser.add_argument("-r", "--repeat", type=int, default=5, help="number of repeats, the best is reported")
+    args = parser.parse_args()
+
+    for name in args.names:
+        if name not in BENCHMARKS:
+            parser.error(f"unknown benchmark: {name}")
+
+    # Headless unless a display is explicitly requested
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    pygame.init()
+    pygame.display.set_mode(WINDOW_SIZE)
+    random.seed(0)
+
+    for name in args.names or BENCHMARKS:
+        print(f"{name}: {BENCHMARKS[name].__doc__}")
+        for variant, fn in BENCHMARKS[name]().items():
+            best = min(Timer(fn).repeat(args.repeat, args.number)) / args.number
+            print(f"  {variant:<24}{best * 1e6:>12.1f} us")
+
+    pygame.quit()
+
+
+if __name__ == "__main__":
+    main()
@@ -2,10 +2,12 @@ from abc import ABC, abstractmethod
 
 import pygame
 from util.func import normalise_for_drawing
-from util.type import Colour, Drawable
+from util.type import Colour, Drawable, Layer
 
 
 class BoxABC(ABC):
+    __slots__ = ()
+
     @property
     @abstractmethod
     def x() -> float:
@@ -48,81 +50,56 @@ class BoxABC(ABC):
 
 
 class Box(BoxABC, Drawable):
-    @property
-    def x(self) -> float:
-        """Alias for :obj:`left`."""
-        return self.left
+    """An axis aligned box.
 
-    @x.setter
-    def x(self, value: float) -> None:
-        self.left = value
+    The position and size are stored as plain slotted attributes (``x``, ``y``, ``width`` and ``height``), so reading
+    them is an attribute lookup instead of a chain of property calls. The other edges are derived from them directly.
+    Hot paths should prefer ``x``/``y``/``width``/``height`` over the derived edges. Widths and heights must not be
+    negative.
+    """
 
-    @property
-    def y(self) -> float:
-        """Alias for :obj:`top`."""
-        return self.top
+    __slots__ = "x", "y", "width", "height"
 
-    @y.setter
-    def y(self, value: float) -> None:
-        self.top = value
+    # The colour of this box on the debug overlay
+    DEBUG_COLOUR: Colour = (0, 0, 255)
+    # The layer of this box when in a map
+    LAYER: Layer = Layer.OTHER
 
     @property
     def left(self) -> float:
-        """The left-most coordinate of this Box."""
-        return self._left
+        """The left-most coordinate of this Box. Alias for :obj:`x`."""
+        return self.x
 
     @left.setter
     def left(self, value: float) -> None:
-        self._left = value
+        self.x = value
 
     @property
     def top(self) -> float:
-        """The top-most coordinate of this Box."""
-        return self._top
+        """The top-most coordinate of this Box. Alias for :obj:`y`."""
+        return self.y
 
     @top.setter
     def top(self, value: float) -> None:
-        self._top = value
+        self.y = value
 
     @property
     def right(self) -> float:
         """The right-most coordinate of this Box."""
-        return self.left + self.width
+        return self.x + self.width
 
     @right.setter
     def right(self, value: float) -> None:
-        self.left = value - self.width
+        self.x = value - self.width
 
     @property
     def bottom(self) -> float:
         """The bottom-most coordinate of this Box."""
-        return self.top + self.height
+        return self.y + self.height
 
     @bottom.setter
     def bottom(self, value: float) -> None:
-        self.top = value - self.height
-
-    @property
-    def width(self) -> int:
-        """The width of this box."""
-        return self._width
-
-    @width.setter
-    def width(self, value: int) -> None:
-        if value < 0:
-            self.x -= value
-        self._width = abs(value)
-
-    @property
-    def height(self) -> int:
-        """The height of this box."""
-        return self._height
-
-    @height.setter
-    def height(self, value: int) -> None:
-        if value < 0:
-            self.y -= value
-        self._height = abs(value)
+        self.y = value - self.height
 
     @property
     def center_x(self) -> float:
@@ -142,9 +119,16 @@ class Box(BoxABC, Drawable):
     def center_y(self, value) -> None:
         self.y = value - self.height / 2
 
+    @property
+    def edges(self) -> tuple[float, float, float, float]:
+        """The left, top, right and bottom of this Box."""
+        x = self.x
+        y = self.y
+        return x, y, x + self.width, y + self.height
+
     def __init__(self, x: float, y: float, width: int, height: int, **kwargs):
-        self.left: float = x
-        self.top: float = y
+        self.x: float = x
+        self.y: float = y
         self.width: int = width
         self.height: int = height
         super().__init__(**kwargs)
@@ -177,6 +161,21 @@ class Box(BoxABC, Drawable):
         if width > 0 and height > 0:
             surface.fill(colour, (x, y, width, height))
 
+    def draw_debug(self, surface: pygame.Surface, x_off: float = 0, y_off: float = 0) -> None:
+        """Draws this box's debug info, by default its bounds, to the debug overlay.
+
+        Parameters
+        ----------
+        surface : pygame.Surface
+            The debug overlay.
+        x_off : float, default = 0
+            The offset in the x direction to draw at.
+        y_off : float, default = 0
+            The offset in the y direction to draw at.
+        """
+
+        Box.draw(self, surface, (*self.DEBUG_COLOUR, 80), x_off, y_off)
+
     def to_json(self) -> dict[str, float | int]:
         """Converts this box to JSON format.
 
@@ -1,12 +1,17 @@
 from __future__ import annotations
 
 import state
-from util.type import Collision, Direction
+from util.type import Collision, Direction, Layer
 
 from .box import Box
 
 
 class Hitbox(Box):
+    __slots__ = ()
+
+    # Boxes within this distance behind a hitbox's front still count as touching, to absorb float rounding
+    CONTACT_EPSILON: float = 1e-6
+
     def move(self, dx: float, dy: float, boxes: set[Hitbox] | None = None) -> list[Collision]:
         """Moves this Hitbox by a given amount while checking for collisions.
 
@@ -32,14 +37,12 @@ class Hitbox(Box):
         """
 
         if boxes is None:
-            from map import Wall
-
             boxes = state.current_map.get_rect(
                 min(self.x, self.x + dx),
                 min(self.y, self.y + dy),
                 self.width + abs(dx),
                 self.height + abs(dy),
-                lambda e: isinstance(e, Wall),
+                layers=Layer.WALL,
             )
 
         collisions = []
@@ -56,6 +59,11 @@ class Hitbox(Box):
 
         Only use this method for single axis movement; Use move() for movement.
 
+        The movement is swept, so fast moving hitboxes can't tunnel through thin boxes. Boxes ahead of this hitbox are
+        checked in order of distance and the movement stops at the first one which blocks it (and any others touched at
+        the same time). Boxes this hitbox already overlaps are resolved afterwards by pushing it out against the
+        direction of movement.
+
         See Also
         --------
         move()
@@ -71,37 +79,104 @@ class Hitbox(Box):
 
         Returns
         -------
-        list of Direction
-            A list of directions which collisions happened in.
+        list of Collision
+            The collisions in the order they happened.
         """
 
+        x = self.x
+        y = self.y
+        right = x + self.width
+        bottom = y + self.height
+        eps = Hitbox.CONTACT_EPSILON
+
+        # Boxes ahead on the axis of movement which overlap on the other axis, and their distance from this hitbox
+        ahead = []
+        if dx > 0:
+            direction = Direction.RIGHT
+            for box in boxes:
+                if box.y < bottom and box.y + box.height > y and -eps <= box.x - right < dx:
+                    ahead.append((box.x - right, box))
+        elif dx < 0:
+            direction = Direction.LEFT
+            for box in boxes:
+                if box.y < bottom and box.y + box.height > y and -eps <= x - box.x - box.width < -dx:
+                    ahead.append((x - box.x - box.width, box))
+        elif dy > 0:
+            direction = Direction.DOWN
+            for box in boxes:
+                if box.x < right and box.x + box.width > x and -eps <= box.y - bottom < dy:
+                    ahead.append((box.y - bottom, box))
+        else:
+            direction = Direction.UP
+            for box in boxes:
+                if box.x < right and box.x + box.width > x and -eps <= y - box.y - box.height < -dy:
+                    ahead.append((y - box.y - box.height, box))
+        ahead.sort(key=lambda hit: hit[0])
+
+        distance = abs(dx or dy)
+        collisions = []
+        contact = None
+        for gap, box in ahead:
+            if contact is not None and gap > contact + eps:
+                break  # Only boxes touched at the same time as the first contact
+            if box.blocks(self):
+                if contact is None:
+                    contact = gap
+                    # Snap exactly against the box so resting contacts are found again next move
+                    if direction is Direction.RIGHT:
+                        dx = box.x - right
+                    elif direction is Direction.LEFT:
+                        dx = box.x + box.width - x
+                    elif direction is Direction.DOWN:
+                        dy = box.y - bottom
+                    else:
+                        dy = box.y + box.height - y
+                collisions.append(Collision(direction, box, max(0, gap) / distance))
+
         self.x += dx
         self.y += dy
 
-        collisions = []
-
+        # Boxes already overlapping (e.g. after a size change), resolved like before sweeping
+        touched = {collision.entity for collision in collisions}
         for box in boxes:
-            if box.detect_collision_box(self):
-                if dx > 0:
-                    collisions.append(Collision(Direction.RIGHT, box))
-                    self.right = box.left
-                elif dx < 0:
-                    collisions.append(Collision(Direction.LEFT, box))
-                    self.left = box.right
-                if dy > 0:
-                    collisions.append(Collision(Direction.DOWN, box))
-                    self.bottom = box.top
-                elif dy < 0:
-                    collisions.append(Collision(Direction.UP, box))
-                    self.top = box.bottom
+            if box not in touched and box.detect_collision_box(self):
+                collisions.append(Collision(direction, box, 1))
+                if direction is Direction.RIGHT:
+                    self.x = box.x - self.width
+                elif direction is Direction.LEFT:
+                    self.x = box.x + box.width
+                elif direction is Direction.DOWN:
+                    self.y = box.y - self.height
+                else:
+                    self.y = box.y + box.height
 
         return collisions
 
+    def blocks(self, box: Box) -> bool:
+        """Whether this Hitbox stops the given box when it moves into this one.
+
+        Parameters
+        ----------
+        box : Box
+            The moving box.
+
+        Returns
+        -------
+        bool
+            If the box should collide with this Hitbox.
+        """
+
+        return True
+
     def detect_collision(self, left: float, top: float, right: float, bottom: float) -> bool:
-        return self.left < right and self.right > left and self.top < bottom and self.bottom > top
+        x = self.x
+        y = self.y
+        return x < right and x + self.width > left and y < bottom and y + self.height > top
 
     def detect_collision_box(self, box: Box) -> bool:
-        return self.detect_collision(box.left, box.top, box.right, box.bottom)
+        x = box.x
+        y = box.y
+        return self.detect_collision(x, y, x + box.width, y + box.height)
 
     def detect_collision_rect(self, left: float, top: float, width: int, height: int) -> bool:
         return self.detect_collision(left, top, left + width, top + height)
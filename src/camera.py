@@ -1,9 +1,112 @@
+from functools import cache
+from weakref import WeakKeyDictionary
+
+import debug
 import pygame
 import state
 from box import Box
 from enemy.enemy import Enemy
-from map import DamageNumber
-from util.type import Drawable, Interactable, Rect, Vec2
+from map import DamageNumber, Gate, Wall
+from util.func import get_font
+from util.type import Blit, Drawable, Interactable, Rect, Vec2
+
+
+@cache
+def _get_debug_font() -> pygame.Font:
+    return get_font("PixelifySans", 18)
+
+
+def _draw_order(box: Box) -> tuple[float, float]:
+    # Lower objects are drawn over higher ones, ties broken left to right
+    return box.bottom, box.left
+
+
+class RenderList:
+    """The map clients visible in a frame, bucketed into draw layers.
+
+    Layers are drawn in the order sprites, health bars, damage numbers then popups, and each layer is sorted so the draw
+    order does not depend on set iteration order.
+    """
+
+    def __init__(self):
+        self.sprites: list[Drawable] = []
+        self.health_bars: list[Enemy] = []
+        self.damage_numbers: list[DamageNumber] = []
+        self.popups: list[Interactable] = []
+
+    def sort(self) -> None:
+        self.sprites.sort(key=_draw_order)
+        self.health_bars.sort(key=_draw_order)
+        self.damage_numbers.sort(key=_draw_order)
+        self.popups.sort(key=_draw_order)
+
+
+class ScaledSurfaces:
+    """Copies of surfaces scaled to a render scale, so each surface is only scaled once per scale.
+
+    Surfaces are assumed not to change after they are first drawn. They are weakly referenced, so the copies of
+    surfaces made every frame (e.g. rotated sprites) are dropped along with them. Only the last couple of scales are
+    kept, which is enough to switch back and forth between render scales with dynamic resolution.
+    """
+
+    KEPT_SCALES: int = 2
+
+    def __init__(self):
+        self.scales: dict[float, WeakKeyDictionary[pygame.Surface, pygame.Surface]] = {}
+
+    @staticmethod
+    def scale(surface: pygame.Surface, scale: float) -> pygame.Surface:
+        return pygame.transform.scale(
+            surface, (max(1, round(surface.width * scale)), max(1, round(surface.height * scale)))
+        )
+
+    def get(self, surface: pygame.Surface, scale: float) -> pygame.Surface:
+        """Gets the given surface scaled by the given scale, scaling it if it hasn't been yet.
+
+        Parameters
+        ----------
+        surface : pygame.Surface
+            The surface to scale.
+        scale : float
+            The scale to scale the surface by.
+
+        Returns
+        -------
+        pygame.Surface
+            The scaled copy of the surface.
+        """
+
+        scaled_surfaces = self.scales.get(scale)
+        if scaled_surfaces is None:
+            if len(self.scales) >= ScaledSurfaces.KEPT_SCALES:
+                del self.scales[next(iter(self.scales))]  # Oldest scale
+            scaled_surfaces = self.scales[scale] = WeakKeyDictionary()
+
+        scaled = scaled_surfaces.get(surface)
+        if scaled is None:
+            scaled = scaled_surfaces[surface] = ScaledSurfaces.scale(surface, scale)
+        return scaled
+
+    def scale_blits(self, blits: list[Blit], scale: float, cached: bool = True) -> list[Blit]:
+        """Scales the given blits, both their surfaces and their positions.
+
+        Parameters
+        ----------
+        blits : list of Blit
+            The blits to scale.
+        scale : float
+            The scale to scale the blits by.
+        cached : bool, default = True
+            Whether to reuse the scaled copies of the surfaces. Surfaces which are redrawn in place must not be cached.
+
+        Returns
+        -------
+        list of Blit
+            The scaled blits.
+        """
+
+        scale_surface = self.get if cached else ScaledSurfaces.scale
+        return [(scale_surface(surface, scale), (x * scale, y * scale)) for surface, (x, y) in blits]
 
 
 class Camera(Box):
@@ -22,8 +125,11 @@ class Camera(Box):
         )
 
     def __init__(self):
+        # Always the size of the window, in world units, no matter the scale the world is rendered at
         super().__init__(0, 0, *pygame.display.get_window_size())
 
+        self.scaled_surfaces: ScaledSurfaces = ScaledSurfaces()
+
     def instant_center(self) -> None:
         self.move(state.player.center_x - self.center_x, state.player.center_y - self.center_y)
 
@@ -46,7 +152,7 @@ class Camera(Box):
             self.bottom = state.current_map.height
 
     def resize(self, width: int, height: int) -> None:
-        """Resizes this camera's viewport to the given size.
+        """Resizes this camera's viewport to the given size, keeping it centered on the same point.
 
         Parameters
         ----------
@@ -56,8 +162,13 @@ class Camera(Box):
             The new height of the viewport.
         """
 
+        center = self.center_x, self.center_y
         self.width = width
         self.height = height
+        self.center_x, self.center_y = center
+
+        if state.current_map and self.bottom > state.current_map.height:
+            self.bottom = state.current_map.height
 
     def tick_move(self, dt: float) -> Vec2:
         """Moves this camera's viewport to center on the target.
@@ -80,61 +191,156 @@ class Camera(Box):
         self.move(dx, dy)
         return dx, dy
 
-    def _render_w_off(self, target: Drawable, window: pygame.Surface, **kwargs) -> None:
-        """Renders the given target to the given surface through this camera's viewport.
-
-        This method draws the target to the surface with an offset of the negative of this camera's position.
-
-        Parameters
-        ----------
-        target : Box
-            The target to render.
-        window : pygame.Surface
-            The surface to render to.
-        kwargs
-            Additional arguments to pass to the target's draw method.
-        """
-
-        target.draw(window, x_off=-self.x, y_off=-self.y, **kwargs)
-
-    def render(self, window: pygame.Surface) -> None:
+    def render(self, window: pygame.Surface, scale: float = 1) -> None:
         """Renders the given map to the given surface through this camera's viewport.
 
+        The viewport is in world units, so rendering at a lower scale keeps the same field of view at a lower
+        resolution. The surface should be the size of the viewport times the scale. Sprites are scaled once per scale
+        and reused, see :class:`ScaledSurfaces`.
+
         See Also
         --------
-        _render_w_off()
         render_debug()
 
         Parameters
         ----------
         window : pygame.Surface
             The surface to render to.
+        scale : float, default = 1
+            The number of surface pixels per world unit.
         """
 
         # Background
         if state.current_map.static_bg:
             window.fill(state.current_map.background)
         else:
-            state.current_map.background.draw(window)
+            state.current_map.background.draw(window, scale)
 
         # Map texture
-        window.blit(state.current_map.texture, (0, 0), (self.x, self.y, self.width, self.height))
+        state.current_map.texture.draw(window, self.x, self.y, self.width, self.height, scale)
 
-        # Entities (enemies, etc)
-        for drawable in state.current_map.get_rect(*self, lambda client: isinstance(client, Drawable)):
-            self._render_w_off(drawable, window)
+        render_list = self.build_render_list()
+        x_off = -self.x
+        y_off = -self.y
 
-        # Player
-        self._render_w_off(state.player, window)
+        # Entities (enemies, etc) then the player
+        render_list.sprites.append(state.player)
+        self._render_batched(render_list.sprites, window, x_off, y_off, scale)
 
-        # Enemy health bars
-        for enemy in state.current_map.get_rect(*self, lambda client: isinstance(client, Enemy)):
-            enemy.draw_health_bar(window, x_off=-self.x, y_off=-self.y)
+        # Enemy health bars, redrawn in place so they can't reuse scaled copies
+        self._blit(
+            window,
+            [blit for enemy in render_list.health_bars for blit in enemy.get_health_bar_blits(x_off, y_off)],
+            scale,
+            cached=False,
+        )
 
         # Damage numbers
-        for dm in state.current_map.get_rect(*self, lambda e: isinstance(e, DamageNumber)):
-            self._render_w_off(dm, window)
+        self._render_batched(render_list.damage_numbers, window, x_off, y_off, scale)
 
         # Interactable popups
-        for i in state.current_map.get_rect(*state.player.interact_range, lambda e: isinstance(e, Interactable)):
-            i.draw_popup(window, x_off=-self.x, y_off=-self.y)
+        self._blit(window, [blit for i in render_list.popups for blit in i.get_popup_blits(x_off, y_off)], scale)
+
+    def render_debug(self, window: pygame.Surface) -> None:
+        """Renders the debug info of everything in this camera's viewport to the shared debug overlay, then the overlay
+        to the given surface.
+
+        Parameters
+        ----------
+        window : pygame.Surface
+            The surface to render to.
+        """
+
+        overlay = debug.get_overlay(window.size)
+        for client in state.current_map.get_rect(*self, cached=True):
+            client.draw_debug(overlay, -self.x, -self.y)
+        state.player.draw_debug(overlay, -self.x, -self.y)
+
+        current_map = state.current_map
+        asleep = current_map.physics.count_asleep()
+        text = _get_debug_font().render(
+            f"Bodies: {len(current_map.physics) - asleep} awake, {asleep} asleep\n"
+            f"Query cache: {current_map.query_hits} hits, {current_map.query_misses} misses",
+            True,
+            (255, 255, 255),
+        )
+        # Top right, clear of the FPS and score
+        x = overlay.width - text.width - 16
+        overlay.fill((0, 0, 0, 120), (x, 0, text.width + 16, text.height + 8))
+        overlay.blit(text, (x + 8, 4))
+
+        window.blit(overlay, (0, 0))
+
+    def _blit(self, window: pygame.Surface, blits: list[Blit], scale: float, cached: bool = True) -> None:
+        window.fblits(blits if scale == 1 else self.scaled_surfaces.scale_blits(blits, scale, cached))
+
+    def _render_batched(
+        self, drawables: list[Drawable], window: pygame.Surface, x_off: float, y_off: float, scale: float = 1
+    ) -> None:
+        """Draws the given drawables in order, submitting their blits in as few batches as possible.
+
+        Drawables which can't be drawn with blits are drawn individually, flushing the batch first to keep the order.
+
+        Parameters
+        ----------
+        drawables : list of Drawable
+            The drawables to draw.
+        window : pygame.Surface
+            The surface to draw to.
+        x_off : float
+            The offset in the x direction to draw at.
+        y_off : float
+            The offset in the y direction to draw at.
+        scale : float, default = 1
+            The number of surface pixels per world unit.
+        """
+
+        blits = []
+        for drawable in drawables:
+            drawable_blits = drawable.get_blits(x_off, y_off)
+            if drawable_blits is None:
+                self._blit(window, blits, scale)
+                blits.clear()
+                if scale == 1:
+                    drawable.draw(window, x_off=x_off, y_off=y_off)
+                else:
+                    drawable.draw(window, x_off=x_off, y_off=y_off, scale=scale)
+            else:
+                blits += drawable_blits
+        self._blit(window, blits, scale)
+
+    def build_render_list(self) -> RenderList:
+        """Collects the map clients to draw this frame with a single query of this camera's viewport.
+
+        Interactables only get a popup if they are also in the player's interact range. The interact range is around
+        the player, so interactables outside the viewport are never in it.
+
+        Returns
+        -------
+        RenderList
+            The clients to draw, bucketed into sorted layers.
+        """
+
+        render_list = RenderList()
+        ix, iy, iw, ih = state.player.interact_range
+
+        for client in state.current_map.get_rect(*self, cached=True):
+            if isinstance(client, DamageNumber):
+                render_list.damage_numbers.append(client)
+            # Walls and gates are part of the map texture
+            elif not isinstance(client, (Wall, Gate)) and isinstance(client, Drawable):
+                render_list.sprites.append(client)
+
+            if isinstance(client, Enemy):
+                render_list.health_bars.append(client)
+            if (
+                isinstance(client, Interactable)
+                and ix < client.right
+                and ix + iw > client.left
+                and iy < client.bottom
+                and iy + ih > client.top
+            ):
+                render_list.popups.append(client)
+
+        render_list.sort()
+        return render_list
@@ -35,6 +35,9 @@ def set_volume(vol: float):
 class Config:
     FILE = user_config_path(APP_NAME, APP_AUTHOR) / "config.json"
 
+    # The minimum render scale, also the lower bound for dynamic resolution
+    MIN_RENDER_SCALE: float = 0.25
+
     @property
     def volume(self) -> float:
         return self._volume
@@ -55,15 +58,47 @@ class Config:
         set_volume(0 if value else self.volume)  # 0 if muted otherwise set back to prev vol
         self.save()
 
+    @property
+    def render_scale(self) -> float:
+        """The resolution the world is rendered at relative to the window, or the maximum with dynamic resolution."""
+        return self._render_scale
+
+    @render_scale.setter
+    def render_scale(self, value: float) -> None:
+        self._render_scale = clamp(value, 1, Config.MIN_RENDER_SCALE)
+        self.save()
+
+    @property
+    def dynamic_resolution(self) -> bool:
+        """Whether to automatically lower the render scale when frames take too long."""
+        return self._dynamic_resolution
+
+    @dynamic_resolution.setter
+    def dynamic_resolution(self, value: bool) -> None:
+        self._dynamic_resolution = value
+        self.save()
+
     def __init__(self):
         data = json.loads(Config.FILE.read_text()) if Config.FILE.is_file() else dict()
         self.volume = data.get("volume", 1)
         self.muted = data.get("muted", False)
+        self.render_scale = data.get("render_scale", 1)
+        self.dynamic_resolution = data.get("dynamic_resolution", False)
 
     def save(self) -> None:
         Config.FILE.parent.mkdir(parents=True, exist_ok=True)
         try:
-            Config.FILE.write_text(json.dumps({"volume": self.volume, "muted": self.muted}, indent=4))
+            Config.FILE.write_text(
+                json.dumps(
+                    {
+                        "volume": self.volume,
+                        "muted": self.muted,
+                        "render_scale": self.render_scale,
+                        "dynamic_resolution": self.dynamic_resolution,
+                    },
+                    indent=4,
+                )
+            )
         except AttributeError:
             pass  # Ignore when not fully initialised
 
@@ -0,0 +1,48 @@
+import logging
+import sys
+
+import pygame
+
+logger = logging.getLogger(__name__)
+
+
+class Debug:
+    """Runtime debug visualisation, toggled in game with F3.
+
+    Everything draws its debug info to a single shared overlay, which is only allocated while debugging is enabled.
+    """
+
+    KEY: int = pygame.K_F3
+
+    def __init__(self):
+        self.enabled: bool = False
+        self._overlay: pygame.Surface | None = None
+
+    def toggle(self) -> None:
+        self.enabled = not self.enabled
+        if not self.enabled:
+            self._overlay = None  # Free the overlay
+        logger.info(f"Debug overlay {'enabled' if self.enabled else 'disabled'}")
+
+    def get_overlay(self, size: tuple[int, int]) -> pygame.Surface:
+        """Gets the cleared debug overlay, allocating it if it doesn't exist or is the wrong size.
+
+        Parameters
+        ----------
+        size : tuple of int
+            The size of the surface the overlay will be drawn on.
+
+        Returns
+        -------
+        pygame.Surface
+            The overlay. Draw translucent colours to it, then blit it over the frame.
+        """
+
+        if self._overlay is None or self._overlay.size != size:
+            self._overlay = pygame.Surface(size, pygame.SRCALPHA).convert_alpha()
+        else:
+            self._overlay.fill((0, 0, 0, 0))
+        return self._overlay
+
+
+sys.modules[__name__] = Debug()
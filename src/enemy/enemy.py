@@ -5,8 +5,8 @@ import state
 from box import Hitbox
 from item.pickup import Pickup
 from map import DamageNumber, Wall
-from util.func import get_project_root, normalise_for_drawing
-from util.type import EnemyState, Side, Size, Sound, Vec2
+from util.func import get_project_root
+from util.type import Blit, Colour, EnemyState, Layer, Rect, Side, Size, Sound, Vec2
 
 from .sense import Sense
 from .sprite import Sprite
@@ -15,10 +15,16 @@ from .sprite import Sprite
 class Enemy(Hitbox, Sense, Sprite):
     I_FRAMES: float = 0.5
 
+    DEBUG_COLOUR: Colour = (255, 0, 0)
+    LAYER: Layer = Layer.ENEMY
+
     H_BAR_OFF: float = 10
     H_BAR_SIZE: Size = 40, 15
     H_BAR_TIME: float = 10  # The time the health bar is rendered after an enemy is hit (s)
     H_BAR_DAMAGE_DECAY: float = 1.3
+    H_BAR_INNER: Rect = 4, 3, 32, 9  # The bounds of the bar inside the border
+    # Health bar surfaces not in use by any enemy, shared so bars are only allocated for the most enemies hit at once
+    H_BAR_POOL: list[pygame.Surface] = []
 
     @property
     def head_x(self) -> float:
@@ -89,6 +95,8 @@ class Enemy(Hitbox, Sense, Sprite):
         self.stagger_time: float = 0
         self.h_bar_time: float = 0
         self.h_bar_damage: float = 0
+        self.h_bar_surface: pygame.Surface | None = None
+        self.h_bar_widths: tuple[int, int] | None = None  # The health and damage widths the surface was rendered with
         self.death_finished: bool = False
         self.loot_dropped: bool = False
 
@@ -131,6 +139,7 @@ class Enemy(Hitbox, Sense, Sprite):
     def tick(self, dt: float) -> None:
         if self.dead:
             self.h_bar_time = 0
+            self._release_health_bar()
         else:
             self._tick_move(dt)
             self._tick_sense(dt)
@@ -209,55 +218,66 @@ class Enemy(Hitbox, Sense, Sprite):
 
         return damage
 
-    def draw_health_bar(self, surface: pygame.Surface, x_off: float = 0, y_off: float = 0, scale: float = 1) -> None:
-        if self.h_bar_time <= 0:
-            return
+    def _render_health_bar(self) -> None:
+        """Rerenders this enemy's health bar if its health or damage bar changed by at least a pixel.
+
+        The surface is taken from the shared pool the first time the bar is shown.
+        """
 
-        h_bar_rect = (
-            self.center_x - Enemy.H_BAR_SIZE[0] / 2,
-            self.top - Enemy.H_BAR_OFF - Enemy.H_BAR_SIZE[1],
-            *Enemy.H_BAR_SIZE,
+        x, y, width, height = Enemy.H_BAR_INNER
+        widths = (
+            int(self.health / self.max_health * width),
+            int(min(1, (self.health + self.h_bar_damage) / self.max_health) * width),
         )
-        draw_rect = normalise_for_drawing(*h_bar_rect, x_off, y_off, scale)
-        if draw_rect[2] <= 0 or draw_rect[3] <= 0:
+        if widths == self.h_bar_widths:
             return
-        surface.fill((50, 50, 50), draw_rect)
 
-        border = 0.8, 0.6
-        inner_left = self.center_x - (Enemy.H_BAR_SIZE[0] * border[0]) / 2
-        inner_top = self.top - Enemy.H_BAR_OFF - Enemy.H_BAR_SIZE[1] * (border[1] + (1 - border[1]) / 2)
-        inner_width = Enemy.H_BAR_SIZE[0] * border[0]
-        inner_height = Enemy.H_BAR_SIZE[1] * border[1]
+        if self.h_bar_surface is None:
+            pool = Enemy.H_BAR_POOL
+            self.h_bar_surface = pool.pop() if pool else pygame.Surface(Enemy.H_BAR_SIZE).convert()
 
-        h_bar_rect = (inner_left, inner_top, inner_width, inner_height)
-        draw_rect = normalise_for_drawing(*h_bar_rect, x_off, y_off, scale)
-        if draw_rect[2] <= 0 or draw_rect[3] <= 0:
-            return
-        surface.fill((80, 80, 80), draw_rect)
+        self.h_bar_widths = widths
+        health_width, damage_width = widths
+        self.h_bar_surface.fill((50, 50, 50))
+        self.h_bar_surface.fill((80, 80, 80), (x, y, width, height))
+        self.h_bar_surface.fill((120, 50, 50), (x, y, damage_width, height))
+        self.h_bar_surface.fill((240, 10, 10), (x, y, health_width, height))
 
-        h_bar_rect = (
-            inner_left,
-            inner_top,
-            ((self.health + self.h_bar_damage) / self.max_health) * inner_width,
-            inner_height,
-        )
-        draw_rect = normalise_for_drawing(*h_bar_rect, x_off, y_off, scale)
-        if draw_rect[2] <= 0 or draw_rect[3] <= 0:
-            return
-        surface.fill((120, 50, 50), draw_rect)
+    def _release_health_bar(self) -> None:
+        """Returns this enemy's health bar surface to the shared pool."""
 
-        h_bar_rect = (inner_left, inner_top, (self.health / self.max_health) * inner_width, inner_height)
-        draw_rect = normalise_for_drawing(*h_bar_rect, x_off, y_off, scale)
-        if draw_rect[2] <= 0 or draw_rect[3] <= 0:
-            return
-        surface.fill((240, 10, 10), draw_rect)
+        if self.h_bar_surface is not None:
+            Enemy.H_BAR_POOL.append(self.h_bar_surface)
+            self.h_bar_surface = None
+            self.h_bar_widths = None
 
-    def draw(self, surface: pygame.Surface, x_off: float = 0, y_off: float = 0, scale: float = 1) -> None:
-        # super().draw(surface, (255, 0, 0), x_off, y_off, scale)
+    def get_health_bar_blits(self, x_off: float = 0, y_off: float = 0) -> list[Blit]:
+        if self.h_bar_time <= 0:
+            self._release_health_bar()
+            return []
+
+        self._render_health_bar()
+        return [
+            (
+                self.h_bar_surface,
+                (
+                    self.center_x + x_off - Enemy.H_BAR_SIZE[0] / 2,
+                    self.top + y_off - Enemy.H_BAR_OFF - Enemy.H_BAR_SIZE[1],
+                ),
+            )
+        ]
+
+    def draw_health_bar(self, surface: pygame.Surface, x_off: float = 0, y_off: float = 0, scale: float = 1) -> None:
+        surface.fblits(self.get_health_bar_blits(x_off, y_off))
+
+    def get_blits(self, x_off: float = 0, y_off: float = 0) -> list[Blit]:
         sprite = self.current_sprite
-        surface.blit(
-            sprite,
-            (self.center_x + x_off - sprite.width / 2, self.y + y_off - (sprite.height - self.height)),
-        )
-        # self.draw_sense(surface, ((0, 255, 0), (200, 50, 50)), x_off, y_off, scale)
-        # self.draw_attack(surface, (165, 30, 30), x_off, y_off, scale)
+        return [(sprite, (self.center_x + x_off - sprite.width / 2, self.y + y_off - (sprite.height - self.height)))]
+
+    def draw(self, surface: pygame.Surface, x_off: float = 0, y_off: float = 0, scale: float = 1) -> None:
+        surface.fblits(self.get_blits(x_off, y_off))
+
+    def draw_debug(self, surface: pygame.Surface, x_off: float = 0, y_off: float = 0) -> None:
+        super().draw_debug(surface, x_off, y_off)
+        self.draw_sense(surface, ((0, 255, 0), (200, 50, 50)), x_off, y_off, 1)
+        self.draw_attack(surface, (165, 30, 30), x_off, y_off, 1)
@@ -3,16 +3,17 @@ from math import copysign
 from random import random, uniform
 
 import state
-from map import Map, Wall
+from map import Wall
+from map.physics import Body
 from util.func import clamp
-from util.type import Direction, EnemyState, Side
+from util.type import Direction, EnemyState, Layer, Side
 
 from ..enemyabc import EnemyABC
 
 logger = logging.getLogger(__name__)
 
 
-class GroundMovement(EnemyABC):
+class GroundMovement(EnemyABC, Body):
     """Enemy movement along a platform."""
 
     # The distance (pixels) between the enemy and it's move target to be considered as reached the target
@@ -28,11 +29,17 @@ class GroundMovement(EnemyABC):
     def moving(self, value: bool) -> None:
         # Can only move when on platform
         self._moving = value and self.on_platform
+        if self._moving:
+            self.wake()
 
     @property
     def speed(self) -> float:
         return self._speed * (1 if self.can_sense_player else self.IDLE_SPEED)
 
+    @property
+    def grip(self) -> float:
+        return self.mass * Wall.FRICTION
+
     def __init__(self, speed: float, **kwargs):
         super().__init__(**kwargs)
         self._speed: float = speed  # Movement speed (px/s)
@@ -61,7 +68,8 @@ class GroundMovement(EnemyABC):
             self.platform.y - self.height,
             self.platform.width,
             self.height,
-            lambda o: o is not self.platform and isinstance(o, Wall),
+            lambda o: o is not self.platform,
+            layers=Layer.WALL,
         )
         if not obstacles:
             logger.debug("No obstacles")
@@ -110,32 +118,29 @@ class GroundMovement(EnemyABC):
     def _tick_move(self, dt: float) -> None:
         """Updates this Enemy's position and has a chance to start idle movement if not currently moving.
 
+        The forces on this Enemy have already been applied by the map's physics world. A sleeping Enemy isn't moved,
+        as the map doesn't update its position in the broadphase, but it can still start moving, which wakes it for the
+        next tick. It is put to sleep when it is standing still on a platform.
+
         Parameters
         ----------
         dt : float
             The seconds between this tick and the last.
         """
 
-        force = (
-            Map.get_air_resistance(self.vx, self.height)
-            + (copysign(Map.GRAVITY * self.mass * Wall.FRICTION, self.vx) if self.on_platform else 0)
-        ) * dt
-        if abs(force) > abs(self.vx):
-            force = self.vx
-        self.vx -= force
-        self.vy += (Map.GRAVITY - Map.get_air_resistance(self.vy, self.width)) * dt
-
-        self.on_platform = False
-        collisions = self.move(self.vx * dt, self.vy * dt)
-        for direction, entity in collisions:
-            if direction is Direction.DOWN and isinstance(entity, Wall):
-                self.vy = 0
-                self.on_platform = True
-                if entity is not self.platform:
-                    self.platform = entity
-                    self.area = self._get_area()
-                    self.moving = False
-                    logger.debug(f"Enemy changed platform: {entity} | Area: {self.area}")
+        asleep = self.asleep
+        if not asleep:
+            self.on_platform = False
+            collisions = self.move(self.vx * dt, self.vy * dt)
+            for direction, entity in collisions:
+                if direction is Direction.DOWN and isinstance(entity, Wall):
+                    self.vy = 0
+                    self.on_platform = True
+                    if entity is not self.platform:
+                        self.platform = entity
+                        self.area = self._get_area()
+                        self.moving = False
+                        logger.debug(f"Enemy changed platform: {entity} | Area: {self.area}")
 
         if self.can_sense_player:
             self.move_target = clamp(
@@ -153,7 +158,7 @@ class GroundMovement(EnemyABC):
         if self.attacking or self.alerting or self.staggered:
             return
 
-        if self.moving:
+        if self.moving and not asleep:
             # Tick movement
             if abs(self.x - self.move_target) < GroundMovement.TARGET_THRESHOLD:
                 self.moving = False
@@ -170,6 +175,8 @@ class GroundMovement(EnemyABC):
             self.state = EnemyState.SPRINTING if self.can_sense_player else EnemyState.WALKING
         else:
             self.state = EnemyState.IDLE
+            if self.on_platform and self.vx == 0 and self.vy == 0:
+                self.sleep()
 
 
 class GroundIdleMovement(GroundMovement):
@@ -1,8 +1,7 @@
 import pygame
 import state
-from map import Wall
 from util.func import line_line, normalise_for_drawing
-from util.type import Colour, EnemyState, Line, Rect
+from util.type import Colour, EnemyState, Layer, Line, Rect
 
 from .enemyabc import EnemyABC
 
@@ -64,9 +63,6 @@ class Sense(EnemyABC):
         self.alert_time: float = 0
         self.alert_retain_time: float = 0
 
-        self._sense_surface: pygame.Surface = pygame.Surface((sense_width, sense_height)).convert()
-        self._sense_surface.set_alpha(40)
-
     def check_for_player(self) -> bool:
         player_in_bounds = state.player.detect_collision_rect(*self.sense_area)
 
@@ -74,19 +70,15 @@ class Sense(EnemyABC):
         if self.xray or not player_in_bounds:
             return player_in_bounds
 
-        obstacles = state.current_map.get_rect(*self.sense_area, lambda o: isinstance(o, Wall))
+        obstacles = state.current_map.get_rect(*self.sense_area, layers=Layer.WALL, cached=True)
         head = self.head_x, self.head_y
         p_left, p_top, p_right, p_bottom = state.player.left, state.player.top, state.player.right, state.player.bottom
 
-        intersections = 0
+        # Player is visible unless all 4 lines to player corners intersect an object
         for corner in (p_left, p_top), (p_left, p_bottom), (p_right, p_top), (p_right, p_bottom):
-            for o in obstacles:
-                if _line_rect((head, corner), o):
-                    intersections += 1
-                    break
-
-        # If all 4 lines to player corners intersect an object, player is not visible
-        return intersections < 4
+            if not any(_line_rect((head, corner), o) for o in obstacles):
+                return True
+        return False
 
     def _tick_sense(self, dt: float) -> None:
         self.can_sense_player = self.check_for_player()
@@ -131,9 +123,8 @@ class Sense(EnemyABC):
             return
 
         colour = colours[1 if self.alerted else 0]
-        self._sense_surface.fill(colour)
+        surface.fill((*colour, 40), (x, y, width, height))
 
-        s2 = pygame.Surface(surface.get_size(), pygame.SRCALPHA)
         if state.player.detect_collision_rect(*self.sense_area):
             head = self.head_x, self.head_y
             head_off = (head[0] + x_off) * scale, (head[1] + y_off) * scale
@@ -146,22 +137,15 @@ class Sense(EnemyABC):
             if self.xray:
                 for corner in (p_left, p_top), (p_left, p_bottom), (p_right, p_top), (p_right, p_bottom):
                     pygame.draw.line(
-                        s2, (*colour, 120), head_off, ((corner[0] + x_off) * scale, (corner[1] + y_off) * scale)
+                        surface, (*colour, 120), head_off, ((corner[0] + x_off) * scale, (corner[1] + y_off) * scale)
                     )
             else:
-                obstacles = state.current_map.get_rect(*self.sense_area, lambda o: isinstance(o, Wall))
+                obstacles = state.current_map.get_rect(*self.sense_area, layers=Layer.WALL, cached=True)
                 for corner in (p_left, p_top), (p_left, p_bottom), (p_right, p_top), (p_right, p_bottom):
-                    intersects = False
-                    for o in obstacles:
-                        if _line_rect((head, corner), o):
-                            intersects = True
-                            break
+                    intersects = any(_line_rect((head, corner), o) for o in obstacles)
                     pygame.draw.line(
-                        s2,
+                        surface,
                         (*colours[0 if intersects else 1], 120),
                         head_off,
                         ((corner[0] + x_off) * scale, (corner[1] + y_off) * scale),
                     )
-
-        surface.blit(self._sense_surface, (x, y))
-        surface.blit(s2, (0, 0))
@@ -1,19 +1,21 @@
 import logging
 import math
 from abc import abstractmethod
+from functools import cache
 from random import random, uniform
 
 import pygame
 import state
 from box import Hitbox
-from map import Map, Wall
+from map import Wall
+from map.physics import Body
 from util.func import (
     get_font,
     get_project_root,
     normalise_for_drawing,
     render_interact_text,
 )
-from util.type import Direction, Interactable, Sound, Vec2
+from util.type import Blit, Colour, Direction, Interactable, Layer, Sound, Vec2
 
 from item import Item
 
@@ -22,12 +24,38 @@ FLOAT_MAX: float = 0.1
 logger = logging.getLogger(__name__)
 
 
+@cache
+def _load_sprite(sprite: str) -> pygame.Surface:
+    return pygame.image.load(get_project_root() / "assets/sprites" / f"{sprite}.png").convert_alpha()
+
+
+@cache
+def _get_sunburst(sprite: str) -> pygame.Surface:
+    """Creates the sunburst for the given sprite. This is cached so each sprite's sunburst is only created once."""
+
+    sprite = _load_sprite(sprite)
+    sunburst = pygame.image.load(get_project_root() / "assets/vfx/Sunburst.png").convert_alpha()
+    # Scale to slightly larger than sprite
+    sunburst = pygame.transform.scale(sunburst, (sprite.width * 1.5, sprite.height * 1.5))
+    # Tint by sprite colour
+    sunburst.fill((*pygame.transform.average_color(sprite)[:3], 255), special_flags=pygame.BLEND_ADD)
+    return sunburst
+
+
+@cache
+def _load_sfx(sfx: str) -> Sound:
+    return Sound(get_project_root() / f"assets/sfx/interact/{sfx}")
+
+
 def _draw_popup_base(surface: pygame.Surface) -> None:
     pygame.draw.rect(surface, (152, 138, 112, 230), (0, 0, surface.width, surface.height), border_radius=3)
     pygame.draw.rect(surface, (210, 193, 158), (0, 0, surface.width, surface.height), width=1, border_radius=3)
 
 
-class Pickup(Hitbox, Interactable):
+class Pickup(Hitbox, Body, Interactable):
+    DEBUG_COLOUR: Colour = (74, 218, 192)
+    LAYER: Layer = Layer.PICKUP
+
     @abstractmethod
     def _create_popup(self) -> pygame.Surface:
         pass
@@ -44,29 +72,20 @@ class Pickup(Hitbox, Interactable):
         vx: float = None,
         vy: float = None,
     ):
-        self.sprite: pygame.Surface = pygame.image.load(
-            get_project_root() / "assets/sprites" / f"{sprite}.png"
-        ).convert_alpha()
+        # Shared between all pickups with the same sprite
+        self.sprite: pygame.Surface = _load_sprite(sprite)
+        self.sunburst: pygame.Surface = _get_sunburst(sprite)
+        self.sfx: Sound = _load_sfx(sfx)
         width, height = self.sprite.size
 
-        self.sunburst: pygame.Surface = pygame.image.load(
-            get_project_root() / "assets/vfx/Sunburst.png"
-        ).convert_alpha()
-        # Scale to slightly larger than sprite
-        self.sunburst = pygame.transform.scale(self.sunburst, (width * 1.5, height * 1.5))
-        # Tint by sprite colour
-        self.sunburst.fill((*pygame.transform.average_color(self.sprite)[:3], 255), special_flags=pygame.BLEND_ADD)
-
-        self.sfx: Sound = Sound(get_project_root() / f"assets/sfx/interact/{sfx}")
-
         if isinstance(platform_or_pos, Wall):
             # Platform
             while True:
                 x = uniform(platform_or_pos.left, platform_or_pos.right - width)
                 y = platform_or_pos.top - height
                 # Check for collisions
-                if not state.current_map.get_rect(
-                    x, y, width, height, lambda o: o is not platform_or_pos and isinstance(o, Wall)
+                if not state.current_map.any_in_rect(
+                    x, y, width, height, lambda o: o is not platform_or_pos, layers=Layer.WALL
                 ):
                     break
         else:
@@ -92,19 +111,22 @@ class Pickup(Hitbox, Interactable):
         self.surface: pygame.Surface = self._create_popup()
 
     def tick(self, dt: float) -> None:
-        self.vx -= Map.get_air_resistance(self.vx, self.height) * dt
-        self.vy += (Map.GRAVITY - Map.get_air_resistance(self.vy, self.width)) * dt
-        collisions = self.move(self.vx * dt, self.vy * dt)
-        for direction, entity in collisions:
-            if direction is Direction.DOWN and isinstance(entity, Wall):
-                self.vx = 0
-                self.vy = 0
-                break
+        # Forces are applied by the map's physics world
+        if not self.asleep:
+            collisions = self.move(self.vx * dt, self.vy * dt)
+            for direction, entity in collisions:
+                if direction is Direction.DOWN and isinstance(entity, Wall):
+                    self.vx = 0
+                    self.vy = 0
+                    # Landed, so at rest until something moves it
+                    self.on_platform = True
+                    self.sleep()
+                    break
 
         if self.vx == 0 and self.vy == 0:
             self.time += dt
 
-    def draw_popup(self, surface: pygame.Surface, x_off: float = 0, y_off: float = 0, **kwargs) -> None:
+    def get_popup_blits(self, x_off: float = 0, y_off: float = 0) -> list[Blit]:
         x, y, _w, _h = normalise_for_drawing(
             self.center_x - self.surface.width / 2,
             self.y - self.surface.height - 20 - self.anim_offset,
@@ -113,11 +135,9 @@ class Pickup(Hitbox, Interactable):
             x_off,
             y_off,
         )
-        surface.blit(self.surface, (x, y))
-
-    def draw(self, surface: pygame.Surface, x_off: float = 0, y_off: float = 0, **kwargs) -> None:
-        # super().draw(surface, (74, 218, 192), x_off, y_off, **kwargs)
+        return [(self.surface, (x, y))]
 
+    def get_blits(self, x_off: float = 0, y_off: float = 0) -> list[Blit]:
         # Rotate sunburst
         sunburst = pygame.transform.rotate(self.sunburst, self.time * self.rot_speed * 10)
         new_rect = sunburst.get_rect(
@@ -128,11 +148,14 @@ class Pickup(Hitbox, Interactable):
                 )
             ).center
         )
-        # Draw sunburst
-        surface.blit(sunburst, new_rect)
+        return [
+            # Sunburst behind sprite
+            (sunburst, new_rect.topleft),
+            (self.sprite, (self.x + x_off, self.y - self.anim_offset + y_off)),
+        ]
 
-        # Actually draw sprite
-        surface.blit(self.sprite, (self.x + x_off, self.y - self.anim_offset + y_off))
+    def draw(self, surface: pygame.Surface, x_off: float = 0, y_off: float = 0, **kwargs) -> None:
+        surface.fblits(self.get_blits(x_off, y_off))
 
 
 class WeaponPickup(Pickup):
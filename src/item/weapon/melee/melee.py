@@ -1,16 +1,23 @@
+from functools import cache
+
 import pygame
 import state
-from enemy.enemy import Enemy
-from util.func import get_project_root, normalise_rect
-from util.type import Colour, Rect, Side, Sound, Vec2
+from util.func import get_project_root, normalise_for_drawing, normalise_rect
+from util.type import Blit, Colour, Layer, Rect, Side, Sound, Vec2
 
 from ...modifier import DamageMod, Modifier, SpeedMod
 from ..weapon import Weapon
 from .sprite import Sprite
 
 
+@cache
+def _get_attack_sfx() -> Sound:
+    return Sound(get_project_root() / "assets/sfx/player/Attack.wav")
+
+
 class MeleeWeapon(Weapon):
     AVAILABLE_MODS: list[Modifier] = [DamageMod, SpeedMod]
+    DEBUG_COLOUR: Colour = (94, 101, 219)
 
     @property
     def atk_top(self) -> float:
@@ -25,12 +32,12 @@ class MeleeWeapon(Weapon):
             self.atk_height,
         )
 
-    @Weapon.left.getter
-    def left(self) -> float:
+    @Weapon.x.getter
+    def x(self) -> float:
         return state.player.arm_x - (self.width if state.player.facing is Side.LEFT else 0)
 
-    @Weapon.top.getter
-    def top(self) -> float:
+    @Weapon.y.getter
+    def y(self) -> float:
         return self.atk_top + (self.atk_height - self.height) * ((self.atk_length - self.atk_time) / self.atk_length)
 
     def __init__(
@@ -54,8 +61,7 @@ class MeleeWeapon(Weapon):
         self.atk_length: float = atk_length  # Length of swing
         self.kb: Vec2 = kb
 
-        self._surface: pygame.Surface = pygame.Surface((atk_width, atk_height)).convert()
-        self.sfx: Sound = Sound(get_project_root() / "assets/sfx/player/Attack.wav")
+        self.sfx: Sound = _get_attack_sfx()
 
         # Apply modifiers
         super().__init__(**kwargs)
@@ -86,7 +92,7 @@ class MeleeWeapon(Weapon):
         if 0 < self.atk_time <= self.atk_length:
             if not self.sfx.playing:
                 self.sfx.play(-1)
-            for enemy in state.current_map.get_rect(*self, lambda e: isinstance(e, Enemy)):
+            for enemy in state.current_map.get_rect(*self, layers=Layer.ENEMY):
                 damage_dealt += enemy.take_hit(damage, kb=self.kb, side=state.player.facing)
 
         if self.atk_time <= 0:
@@ -97,6 +103,22 @@ class MeleeWeapon(Weapon):
 
         return damage_dealt
 
+    def get_blits(self, x_off: float = 0, y_off: float = 0) -> list[Blit]:
+        if self.atk_time <= 0:
+            return []
+
+        facing = state.player.facing
+        sprite = self.sprite_obj.get_current_sprite(facing)
+        return [
+            (
+                sprite,
+                (
+                    state.player.arm_x + x_off - (sprite.width if facing is Side.LEFT else 0),
+                    state.player.arm_y + y_off - sprite.height / 2,
+                ),
+            )
+        ]
+
     def draw(
         self,
         surface: pygame.Surface,
@@ -105,32 +127,16 @@ class MeleeWeapon(Weapon):
         y_off: float = 0,
         scale: float = 1,
     ) -> None:
+        surface.fblits(self.get_blits(x_off, y_off))
+
+    def draw_debug(self, surface: pygame.Surface, x_off: float = 0, y_off: float = 0) -> None:
         if self.atk_time <= 0:
             return
 
-        # from util.func import normalise_for_drawing
-
-        # x, y, width, height = normalise_for_drawing(*self.atk_area, x_off, y_off, scale)
-        # if width <= 0 or height <= 0:
-        #     return
-
-        # self._surface.set_alpha(120)
-        # self._surface.fill(colour)
-        # surface.blit(self._surface, (x, y))
-
-        # if self.atk_time <= self.atk_length:
-        #     x, y, width, height = normalise_for_drawing(*self, x_off, y_off, scale)
-        #     if width <= 0 or height <= 0:
-        #         return
-        #     self._surface.set_alpha(180)
-        #     surface.blit(self._surface, (x, y), (0, 0, width, height))
+        # Total attack area, then the current hitbox while swinging
+        x, y, width, height = normalise_for_drawing(*self.atk_area, x_off, y_off, 1)
+        if width > 0 and height > 0:
+            surface.fill((*self.DEBUG_COLOUR, 120), (x, y, width, height))
 
-        facing = state.player.facing
-        sprite = self.sprite_obj.get_current_sprite(facing)
-        surface.blit(
-            sprite,
-            (
-                state.player.arm_x + x_off - (sprite.width if facing is Side.LEFT else 0),
-                state.player.arm_y + y_off - sprite.height / 2,
-            ),
-        )
+        if self.atk_time <= self.atk_length:
+            super().draw_debug(surface, x_off, y_off)
@@ -1,3 +1,4 @@
+from functools import cache
 from pathlib import Path
 
 import pygame
@@ -9,7 +10,10 @@ type SpriteDirectionList = list[pygame.Surface]
 type SpriteList = tuple[SpriteDirectionList, SpriteDirectionList]  # Left, right
 
 
+@cache
 def _get_sprites_from_sheet(sheet: Path, num_frames: int) -> SpriteList:
+    """Loads and slices the given sheet. The frames are cached so all weapons of the same type share them."""
+
     sheet = pygame.image.load(sheet)
     width = sheet.width // num_frames
     height = sheet.height
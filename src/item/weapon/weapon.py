@@ -2,27 +2,30 @@ from abc import abstractmethod
 
 import state
 from box import Hitbox
+from util.type import Blit
 
 from ..item import Item
 
 
 class Weapon(Hitbox, Item):
+    # The position of a weapon follows the player, so subclasses override the position instead of storing it
+
     @property
     @abstractmethod
-    def left(self) -> float:
+    def x(self) -> float:
         pass
 
-    @left.setter
-    def left(self, value):
+    @x.setter
+    def x(self, value):
         pass
 
     @property
     @abstractmethod
-    def top(self) -> float:
+    def y(self) -> float:
         pass
 
-    @top.setter
-    def top(self, value):
+    @y.setter
+    def y(self, value):
         pass
 
     def __init__(self, damage: int, **kwargs):
@@ -45,3 +48,8 @@ class Weapon(Hitbox, Item):
     @abstractmethod
     def tick(self, dt: float) -> int:
         pass
+
+    @abstractmethod
+    def get_blits(self, x_off: float = 0, y_off: float = 0) -> list[Blit]:
+        """The blits that draw this Weapon, drawn with the player's blits."""
+        pass
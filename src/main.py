@@ -3,6 +3,7 @@ from argparse import ArgumentParser
 
 import pygame
 from constants import APP_DESC, APP_NAME
+from map import Map
 from ui.screens import MainMenu
 from util.func import get_project_root
 
@@ -10,6 +11,7 @@ from util.func import get_project_root
 def main():
     parser = ArgumentParser(description=APP_DESC)
     parser.add_argument("--log-level", type=str, default="warning", help="minimum log level to display")
+    parser.add_argument("--cell-size", type=int, help="override the map broadphase cell size picked on load")
     args = parser.parse_args()
 
     numeric_log_level = getattr(logging, args.log_level.upper(), None)
@@ -19,6 +21,11 @@ def main():
         level=numeric_log_level, format="%(name)s - %(asctime)s - [%(levelname)s] %(message)s", datefmt="%H:%M:%S"
     )
 
+    if args.cell_size is not None:
+        if args.cell_size <= 0:
+            parser.error("--cell-size must be positive")
+        Map.CELL_SIZE = args.cell_size
+
     pygame.init()
 
     pygame.display.set_icon(pygame.image.load(get_project_root() / "assets/icon.png"))
@@ -1,22 +1,72 @@
+import math
+from functools import cache, lru_cache
+
 import pygame
 import state
 from util.func import get_project_root
 
 
+@cache
+def _get_layers() -> list[pygame.Surface]:
+    """Loads the background layers once, so every map shares them."""
+
+    layers = []
+    for layer in sorted((get_project_root() / "assets/background").iterdir()):
+        layer = pygame.image.load(layer).convert()
+        layer.set_colorkey((0, 0, 0), pygame.RLEACCEL)
+        layers.append(layer)
+    layers[0].set_colorkey(None, pygame.RLEACCEL)  # Base layer doesn't need alpha
+    return layers
+
+
+@lru_cache(maxsize=2)
+def _get_strips(width: int, height: int) -> list[pygame.Surface]:
+    """Scales the background layers for the given viewport size and tiles them into strips at least as wide.
+
+    Only the last couple of sizes are kept, which is enough to switch back and forth between render scales without
+    rescaling every time.
+
+    Parameters
+    ----------
+    width : int
+        The width of the viewport.
+    height : int
+        The height of the viewport.
+
+    Returns
+    -------
+    list of pygame.Surface
+        The strip of each layer. A strip's width is a multiple of its layer's width so it wraps seamlessly.
+    """
+
+    height *= 1.5
+    strips = []
+    for layer in _get_layers():
+        if height != layer.height:
+            layer = pygame.transform.scale_by(layer, height / layer.height)
+
+        tiles = math.ceil(width / layer.width)
+        if tiles > 1:
+            # Only very wide viewports need a strip, otherwise the layer is already wide enough
+            strip = pygame.Surface((layer.width * tiles, layer.height)).convert()
+            strip.fblits((layer, (layer.width * i, 0)) for i in range(tiles))
+            strip.set_colorkey(layer.get_colorkey(), pygame.RLEACCEL)
+            layer = strip
+
+        strips.append(layer)
+    return strips
+
+
 class Background:
     def __init__(self):
-        width, height = pygame.display.get_window_size()
+        # Same size as the surface it is drawn to, which is smaller than the viewport when rendering at a lower scale
+        width, height = int(state.camera.width), int(state.camera.height)
         self.width: int = width
         self.height: int = height
 
-        self.orig_layers: list[pygame.Surface] = []
-        self.layers: list[pygame.Surface] = []
-
-        for layer in sorted((get_project_root() / "assets/background").iterdir()):
-            layer = pygame.image.load(layer).convert()
-            layer.set_colorkey((0, 0, 0), pygame.RLEACCEL)
-            self.orig_layers.append(layer)
-        self.orig_layers[0].set_colorkey(None, pygame.RLEACCEL)  # Base layer doesn't need alpha
+        self.strips: list[pygame.Surface] = []
+        # The vertical offset of each strip when the camera is at the bottom of the map
+        self.y_offs: list[float] = []
 
         self.resize(width, height, override=True)
 
@@ -27,23 +77,35 @@ class Background:
         self.width = width
         self.height = height
 
-        height *= 1.5
-        self.layers = [
-            pygame.transform.scale_by(layer, (height / layer.height)) if height != layer.height else layer
-            for layer in self.orig_layers
-        ]
+        self.strips = _get_strips(width, height)
+        self.y_offs = [(strip.height - height) * -0.6 for strip in self.strips]
+
+    def draw(self, surface: pygame.Surface, scale: float = 1) -> None:
+        """Draws the background layers to the given surface with parallax, resizing them to the surface if needed.
+
+        Parameters
+        ----------
+        surface : pygame.Surface
+            The surface to draw to.
+        scale : float, default = 1
+            The number of surface pixels per world unit, for the parallax offsets.
+        """
+
+        self.resize(*surface.size)
+
+        dx = (state.current_map.width - state.camera.center_x) * scale
+        dy = (state.current_map.height - state.camera.bottom) * scale
 
-    def draw(self, surface: pygame.Surface) -> None:
         blits = []
-        for idx, layer in enumerate(self.layers):
-            x = (((state.current_map.width - state.camera.center_x) * idx) / 8) % layer.width
+        for idx, (strip, y_off) in enumerate(zip(self.strips, self.y_offs)):
+            x = (dx * idx / 8) % strip.width
             if x > 0:
-                x -= layer.width
-
-            y = ((state.current_map.height - state.camera.bottom) * idx) / 16 - (layer.height - self.height) * 0.6
+                x -= strip.width
+            y = dy * idx / 16 + y_off
 
-            while x < self.width:
-                blits.append((layer, (x, y)))
-                x += layer.width
+            blits.append((strip, (x, y)))
+            # Wrap around
+            if x + strip.width < self.width:
+                blits.append((strip, (x + strip.width, y)))
 
-        surface.blits(blits)
+        surface.fblits(blits)
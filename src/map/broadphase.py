@@ -0,0 +1,303 @@
+from abc import ABC, abstractmethod
+from collections.abc import Callable, Iterator
+from math import ceil, floor
+
+from box import Box
+from util.type import Layer
+
+type Cell = set[Box]
+type Row = list[Cell | None]
+type Grid = list[Row | None]
+
+ALL_LAYERS: int = Layer.ALL.value
+
+
+class Broadphase(ABC):
+    """A spatial index of the clients of a map, which finds the clients in an area without checking every client.
+
+    Clients must not move or change size while they are in the index, remove them first and add them back after.
+    Layers are given as the value of a :class:`util.type.Layer` mask.
+    """
+
+    def __init__(self, width: int, height: int, cell_size: int):
+        self.width: int = width
+        self.height: int = height
+        self.cell_size: int = cell_size
+
+    @abstractmethod
+    def add(self, box: Box) -> None:
+        pass
+
+    @abstractmethod
+    def remove(self, box: Box) -> None:
+        pass
+
+    @abstractmethod
+    def query(self, x: float, y: float, width: float, height: float, precision: bool, layers: int) -> set[Box]:
+        """Collects the clients within the given rectangle.
+
+        Parameters
+        ----------
+        x : float
+            The left-most x coordinate of the rectangle to search in.
+        y : float
+            The top-most y coordinate of the rectangle to search in.
+        width : float
+            The width of the rectangle to search in.
+        height : float
+            The height of the rectangle to search in.
+        precision : bool
+            Whether to check for precise bounds or just return the clients of the cells the rectangle is in.
+        layers : int
+            The layers to search.
+
+        Returns
+        -------
+        set of Box
+            The clients within the given rectangle.
+        """
+
+    @abstractmethod
+    def iter(
+        self, x: float, y: float, width: float, height: float, filter_fn: Callable[[Box], bool] | None, layers: int
+    ) -> Iterator[Box]:
+        """Lazily yields the clients precisely within the given rectangle, each once.
+
+        Parameters
+        ----------
+        x : float
+            The left-most x coordinate of the rectangle to search in.
+        y : float
+            The top-most y coordinate of the rectangle to search in.
+        width : float
+            The width of the rectangle to search in.
+        height : float
+            The height of the rectangle to search in.
+        filter_fn : callable with parameters [Box] and return bool, optional
+            A function to filter for specific clients.
+        layers : int
+            The layers to search.
+
+        Yields
+        ------
+        Box
+            The clients within the given rectangle.
+        """
+
+    @abstractmethod
+    def nearest(self, x: float, y: float, filter_fn: Callable[[Box], bool] = None, max_depth: int = -1) -> Box | None:
+        """Finds a client near the given point.
+
+        Parameters
+        ----------
+        x : float
+            The x coordinate of the point.
+        y : float
+            The y coordinate of the point.
+        filter_fn : callable with parameters [Box] and return bool, optional
+            A function to filter for specific clients.
+        max_depth : int, default -1
+            The furthest to search in cells, or negative to search everything.
+
+        Returns
+        -------
+        Box or None
+            The nearest client, or None if there are none within range.
+        """
+
+
+class SpatialGrid(Broadphase):
+    """A uniform grid of cells, each holding the clients which intersect it.
+
+    Clients are added to every cell they touch, so large clients are in many cells.
+    """
+
+    def __init__(self, width: int, height: int, cell_size: int):
+        super().__init__(width, height, cell_size)
+        self.rows: int = ceil(height / cell_size) + 1
+        self.cols: int = ceil(width / cell_size) + 1
+        self.grid: Grid = [None] * self.rows
+
+    def _to_cells(self, x: float, y: float, width: float, height: float) -> tuple[int, int, int, int]:
+        """Converts the given rectangle to the cell coordinates of each side (left, top, right, bottom).
+
+        Parameters
+        ----------
+        x : float
+            The left-most x coordinate of the rectangle.
+        y : float
+            The top-most y coordinate of the rectangle.
+        width : float
+            The width of the rectangle.
+        height : float
+            The height of the rectangle.
+
+        Returns
+        -------
+        tuple of int
+            The coordinates of the left-most cell, top-most cell, right-most cell and bottom-most cell as a tuple.
+        """
+
+        return (
+            floor(x / self.cell_size),
+            floor(y / self.cell_size),
+            ceil((x + width) / self.cell_size),
+            ceil((y + height) / self.cell_size),
+        )
+
+    def add(self, box: Box) -> None:
+        start_col, start_row, end_col, end_row = self._to_cells(box.x, box.y, box.width, box.height)
+        for row in range(start_row, end_row + 1):
+            for col in range(start_col, end_col + 1):
+                self._add_to_cell(box, row, col)
+
+    def _add_to_cell(self, client: Box, row: int, col: int) -> None:
+        """Inserts a client (Box) into this grid at the given position.
+
+        This method should only be called from add().
+
+        See Also
+        --------
+        add()
+
+        Parameters
+        ----------
+        client : Box
+            The client to insert into the grid.
+        row : int
+            The row to insert the client into.
+        col : int
+            The column to insert the client into.
+        """
+
+        if row < 0 or row >= self.rows or col < 0 or col >= self.cols:
+            return
+
+        if self.grid[row] is None:
+            self.grid[row] = [None] * self.cols
+        if self.grid[row][col] is None:
+            self.grid[row][col] = set()
+        self.grid[row][col].add(client)
+
+    def remove(self, box: Box) -> None:
+        start_col, start_row, end_col, end_row = self._to_cells(box.x, box.y, box.width, box.height)
+        for row in range(start_row, end_row + 1):
+            for col in range(start_col, end_col + 1):
+                if row >= 0 and row < self.rows and col >= 0 and col < self.cols:
+                    self.grid[row][col].remove(box)
+
+    def query(self, x: float, y: float, width: float, height: float, precision: bool, layers: int) -> set[Box]:
+        all_layers = layers == ALL_LAYERS
+        clients = set()
+        right = x + width
+        bottom = y + height
+        s_col, s_row, e_col, e_row = self._to_cells(x, y, width, height)
+        if s_row < 0:
+            s_row = 0
+        if e_row >= self.rows:
+            e_row = self.rows
+        if s_col < 0:
+            s_col = 0
+        if e_col >= self.cols:
+            e_col = self.cols
+
+        for row in range(s_row, e_row):
+            if self.grid[row] is not None:
+                for col in range(s_col, e_col):
+                    cell = self.grid[row][col]
+                    if cell is not None:
+                        if precision:
+                            for c in cell:
+                                cx = c.x
+                                cy = c.y
+                                if (
+                                    x < cx + c.width
+                                    and right > cx
+                                    and y < cy + c.height
+                                    and bottom > cy
+                                    and (all_layers or c.LAYER.value & layers)
+                                ):
+                                    clients.add(c)
+                        elif all_layers:
+                            clients |= cell
+                        else:
+                            clients.update(c for c in cell if c.LAYER.value & layers)
+
+        return clients
+
+    def iter(
+        self, x: float, y: float, width: float, height: float, filter_fn: Callable[[Box], bool] | None, layers: int
+    ) -> Iterator[Box]:
+        # A client in multiple cells is only yielded from the cell containing the top left of its overlap with the
+        # rectangle, so no set is needed to skip duplicates
+        all_layers = layers == ALL_LAYERS
+        cell_size = self.cell_size
+        last_row = self.rows - 1
+        last_col = self.cols - 1
+        right = x + width
+        bottom = y + height
+        s_col, s_row, e_col, e_row = self._to_cells(x, y, width, height)
+        s_row = max(s_row, 0)
+        e_row = min(e_row, self.rows)
+        s_col = max(s_col, 0)
+        e_col = min(e_col, self.cols)
+
+        for row in range(s_row, e_row):
+            grid_row = self.grid[row]
+            if grid_row is None:
+                continue
+            for col in range(s_col, e_col):
+                cell = grid_row[col]
+                if cell is None:
+                    continue
+                for c in cell:
+                    cx = c.x
+                    cy = c.y
+                    if not (x < cx + c.width and right > cx and y < cy + c.height and bottom > cy):
+                        continue
+                    # Only yield from the cell of the reference point, clamped like the client's cells are
+                    ref_col = min(max(floor(max(x, cx) / cell_size), 0), last_col)
+                    ref_row = min(max(floor(max(y, cy) / cell_size), 0), last_row)
+                    if (
+                        ref_col == col
+                        and ref_row == row
+                        and (all_layers or c.LAYER.value & layers)
+                        and (filter_fn is None or filter_fn(c))
+                    ):
+                        yield c
+
+    def nearest(self, x: float, y: float, filter_fn: Callable[[Box], bool] = None, max_depth: int = -1) -> Box | None:
+        """Finds a client near the given point, searching rings of cells outwards from it.
+
+        This is faster than an exact search, but only returns the nearest client in the first ring with a match.
+        """
+
+        col = floor(x / self.cell_size)
+        row = floor(y / self.cell_size)
+
+        depth_cap = max(col, row, self.cols - col, self.rows - row)
+        if max_depth < 0 or max_depth > depth_cap:
+            max_depth = depth_cap
+
+        depth = 1
+        nearest = None
+        nearest_d_sq = -1
+        while nearest is None and depth <= max_depth:
+            for i in range(-depth, depth + 1):
+                r = row + i
+                if r >= 0 and r < self.rows and self.grid[r] is not None:
+                    for j in range(-depth, depth + 1):
+                        if abs(i) >= depth or abs(j) >= depth:
+                            c = col + j
+                            if c >= 0 and c < self.cols:
+                                cell = self.grid[r][c]
+                                if cell is not None:
+                                    for client in filter(filter_fn, cell) if callable(filter_fn) else cell:
+                                        d_sq = (client.center_x - x) ** 2 + (client.center_y - y) ** 2
+                                        if nearest_d_sq < 0 or d_sq < nearest_d_sq:
+                                            nearest = client
+                                            nearest_d_sq = d_sq
+
+            depth += 1
+
+        return nearest
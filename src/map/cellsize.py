@@ -0,0 +1,87 @@
+from collections.abc import Iterable
+
+from box import Box
+
+type Workload = tuple[float, float, float]  # Width, height, times per tick
+
+
+class CellSizeModel:
+    """Estimates the cost per tick of a map's broadphase grid for a cell size, to pick the cheapest one.
+
+    A query visits every cell it overlaps and checks every client in them, and moving a client removes it from and
+    adds it to every cell it overlaps. The costs are relative weights of those operations, roughly measured with the
+    broadphase benchmarks.
+    """
+
+    # Relative cost of visiting a cell, checking a client in a visited cell and moving a client between cells
+    CELL_COST: float = 1
+    CLIENT_COST: float = 0.8
+    MOVE_COST: float = 1.5
+
+    MIN_CELL_SIZE: int = 32
+    CELL_SIZE_STEP: int = 16
+
+    @staticmethod
+    def cells_queried(width: float, height: float, cell_size: int) -> float:
+        """The expected number of cells a query of the given size visits, averaged over its offset in the grid."""
+        return (width / cell_size + 1) * (height / cell_size + 1)
+
+    @staticmethod
+    def cells_occupied(width: float, height: float, cell_size: int) -> float:
+        """The expected number of cells a client of the given size is in, averaged over its offset in the grid.
+
+        A client is also added to the cells just past its right and bottom edges, so this is one more cell per axis
+        than a query of the same size.
+        """
+        return (width / cell_size + 2) * (height / cell_size + 2)
+
+    def __init__(
+        self,
+        width: int,
+        height: int,
+        clients: Iterable[Box],
+        queries: dict[str, Workload],
+        moves: dict[str, Workload],
+    ):
+        self.width: int = width
+        self.height: int = height
+        self.client_sizes: list[tuple[float, float]] = [(c.width, c.height) for c in clients]
+        # The sizes of the queries and moved clients, by what makes them
+        self.queries: dict[str, Workload] = queries
+        self.moves: dict[str, Workload] = moves
+
+    def occupancy(self, cell_size: int) -> float:
+        """The expected number of clients in a cell."""
+
+        cells = (self.width / cell_size + 1) * (self.height / cell_size + 1)
+        return sum(CellSizeModel.cells_occupied(w, h, cell_size) for w, h in self.client_sizes) / cells
+
+    def cost(self, cell_size: int) -> float:
+        occupancy = self.occupancy(cell_size)
+        query_cost = sum(
+            count * CellSizeModel.cells_queried(w, h, cell_size) * (self.CELL_COST + occupancy * self.CLIENT_COST)
+            for w, h, count in self.queries.values()
+        )
+        move_cost = sum(
+            count * CellSizeModel.cells_occupied(w, h, cell_size) * self.MOVE_COST
+            for w, h, count in self.moves.values()
+        )
+        return query_cost + move_cost
+
+    def best(self) -> int:
+        """Finds the cell size with the lowest cost, searching up to a quarter of the smaller map side."""
+
+        max_size = max(self.MIN_CELL_SIZE, min(self.width, self.height) // 4)
+        return min(range(self.MIN_CELL_SIZE, max_size + 1, self.CELL_SIZE_STEP), key=self.cost)
+
+    def describe(self, cell_size: int) -> str:
+        """A summary of the expected work per query and per tick with the given cell size, for diagnostics."""
+
+        occupancy = self.occupancy(cell_size)
+        lines = [f"cell size {cell_size}: {occupancy:.2f} clients per cell, relative cost {self.cost(cell_size):.0f}"]
+        for name, (w, h, count) in self.queries.items():
+            cells = CellSizeModel.cells_queried(w, h, cell_size)
+            lines.append(
+                f"  {name} ({w:.0f}x{h:.0f}, {count:.1f}/tick): {cells:.1f} cells, {cells * occupancy:.1f} clients"
+            )
+        return "\n".join(lines)
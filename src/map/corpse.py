@@ -4,7 +4,7 @@ import pygame
 import state
 from box import Box
 from util.func import get_project_root, render_interact_text
-from util.type import Interactable, Sound
+from util.type import Blit, Colour, Interactable, Layer, Sound
 
 from .wall import Wall
 
@@ -21,6 +21,8 @@ def _create_popup(text: str, key: bool = True) -> pygame.Surface:
 
 
 class Corpse(Box, Interactable):
+    DEBUG_COLOUR: Colour = (53, 43, 243)
+
     def __init__(self, platform: Wall):
         sprite = pygame.image.load(
             choice([f for f in (get_project_root() / "assets/sprites/corpses").iterdir() if f.is_file()])
@@ -34,7 +36,7 @@ class Corpse(Box, Interactable):
             x = uniform(platform.left, platform.right - width)
             y = platform.top - height
             # Check for collisions
-            if not state.current_map.get_rect(x, y, width, height, lambda o: o is not platform and isinstance(o, Wall)):
+            if not state.current_map.any_in_rect(x, y, width, height, lambda o: o is not platform, layers=Layer.WALL):
                 break
 
         super().__init__(x, y, width, height)
@@ -55,12 +57,18 @@ class Corpse(Box, Interactable):
         else:
             self.popup = _create_popup("Womp Womp", key=False)
 
-    def draw_popup(self, surface: pygame.Surface, x_off: float, y_off: float, **kwargs) -> None:
-        if self.popup is not None:
-            surface.blit(
+    def get_popup_blits(self, x_off: float, y_off: float) -> list[Blit]:
+        if self.popup is None:
+            return []
+        return [
+            (
                 self.popup,
                 (self.center_x + x_off - self.popup.width / 2, self.y - self.height * 0.1 - self.popup.height + y_off),
             )
+        ]
+
+    def get_blits(self, x_off: float, y_off: float) -> list[Blit]:
+        return [(self.sprite, (self.x + x_off, self.y + y_off))]
 
     def draw(
         self,
@@ -69,5 +77,4 @@ class Corpse(Box, Interactable):
         y_off: float = 0,
         scale: float = 1,
     ) -> None:
-        # super().draw(surface, (53, 43, 243), x_off, y_off, scale)
-        surface.blit(self.sprite, (self.x + x_off, self.y + y_off))
+        surface.fblits(self.get_blits(x_off, y_off))
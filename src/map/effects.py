@@ -1,18 +1,29 @@
 from math import sqrt
 
 import pygame
+import state
 from box import Box
 from util.func import clamp, get_font
+from util.type import Blit, Layer
 
-from .map import Map
+from .physics import Body
 
 
-class DamageNumber(Box):
+class DamageNumber(Box, Body):
+    LAYER: Layer = Layer.EFFECT
+
     REMOVE_THRESHOLD: int = 20
 
+    FALLS: bool = False
+
+    @property
+    def drag_areas(self) -> tuple[float, float]:
+        # Much more air resistance than its size, so it floats away and slows down quickly
+        return sqrt(self.height) * 50, sqrt(self.width) * 50
+
     def __init__(self, damage: int, center_x: float, center_y: float, vx: float, vy: float):
         self.surface: pygame.Surface = get_font(
-            "Silkscreen", int(pygame.display.get_window_size()[1] * sqrt(damage)) // 1000 + 16
+            "Silkscreen", int(state.camera.height * sqrt(damage)) // 1000 + 16
         ).render(str(damage), True, pygame.Color(168, 208, 204).lerp((228, 59, 54), clamp(damage / 300, 1, 0)))
 
         super().__init__(center_x - self.surface.width / 2, center_y - self.surface.height / 2, *self.surface.size)
@@ -24,11 +35,11 @@ class DamageNumber(Box):
         if abs(self.vx) < DamageNumber.REMOVE_THRESHOLD or abs(self.vy) < DamageNumber.REMOVE_THRESHOLD:
             return True
 
-        self.vx -= Map.get_air_resistance(self.vx, sqrt(self.height)) * dt * 50
-        self.vy -= Map.get_air_resistance(self.vy, sqrt(self.width)) * dt * 50
-
         self.x += self.vx * dt
         self.y += self.vy * dt
 
+    def get_blits(self, x_off: float, y_off: float) -> list[Blit]:
+        return [(self.surface, (self.x + x_off, self.y + y_off))]
+
     def draw(self, surface: pygame.Surface, x_off: float, y_off: float) -> None:
-        surface.blit(self.surface, (self.x + x_off, self.y + y_off))
+        surface.fblits(self.get_blits(x_off, y_off))
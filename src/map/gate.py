@@ -4,7 +4,7 @@ import pygame
 import state
 from box import Box
 from util.func import get_project_root, render_interact_text
-from util.type import Interactable, Sound
+from util.type import Blit, Colour, Interactable, Sound
 
 logger = logging.getLogger(__name__)
 
@@ -21,6 +21,8 @@ def _create_popup() -> pygame.Surface:
 
 
 class Gate(Box, Interactable):
+    DEBUG_COLOUR: Colour = (94, 66, 195)
+
     def __init__(self, x: float, y: float, width: int, height: int):
         super().__init__(x, y, width, height)
         self.popup: pygame.Surface = _create_popup()
@@ -36,8 +38,8 @@ class Gate(Box, Interactable):
         state.current_map = Map()
         state.map_loaded = False
 
-    def draw_popup(self, surface: pygame.Surface, x_off: float, y_off: float, **kwargs) -> None:
-        surface.blit(self.popup, (self.center_x + x_off - self.popup.width / 2, self.y + self.height * 0.4 + y_off))
+    def get_popup_blits(self, x_off: float, y_off: float) -> list[Blit]:
+        return [(self.popup, (self.center_x + x_off - self.popup.width / 2, self.y + self.height * 0.4 + y_off))]
 
     def draw(
         self,
@@ -46,5 +48,4 @@ class Gate(Box, Interactable):
         y_off: float = 0,
         scale: float = 1,
     ) -> None:
-        # super().draw(surface, (94, 66, 195), x_off, y_off, scale)
         pass  # Ignore, part of texture
@@ -5,22 +5,28 @@ import json
 import logging
 import random
 import time
-from collections.abc import Callable
-from math import ceil, copysign, floor
+from collections import OrderedDict
+from collections.abc import Callable, Iterator
+from math import copysign, floor
 from pathlib import Path
-from types import SimpleNamespace
+from statistics import median
 from typing import TYPE_CHECKING
 
 import pygame
 import state
 from box import Box
 from util.func import clamp, get_project_root
-from util.type import Side
+from util.type import Layer, Side
 
 from .background import Background
+from .broadphase import Broadphase, SpatialGrid
+from .cellsize import CellSizeModel
 from .corpse import Corpse
 from .gate import Gate
+from .physics import Body, PhysicsWorld
 from .platform import Platform
+from .schema import BoundsSpec, Segment
+from .texture import SplitTexture
 from .wall import Wall
 
 if TYPE_CHECKING:
@@ -30,10 +36,6 @@ if TYPE_CHECKING:
     from .effects import DamageNumber
 
 
-type Cell = set[Box]
-type Row = list[Cell | None]
-type Grid = list[Row | None]
-
 ENEMIES = None
 WEAPONS = None
 
@@ -41,11 +43,19 @@ logger = logging.getLogger(__name__)
 
 
 class Map:
+    """A level made of randomly picked segments, and everything in it."""
+
     GRAVITY: int = 1000
     AIR_RESISTANCE: float = 0.0002
 
     SAFE_RANGE: int = 100
 
+    # Overrides the cell size picked for each map, for experiments
+    CELL_SIZE: int | None = None
+
+    # The most queries kept in the cache for get_rect(cached=True), the least recently used are dropped first
+    QUERY_CACHE_SIZE: int = 512
+
     @staticmethod
     def storage() -> Path:
         return get_project_root() / "assets/maps/ramparts"
@@ -69,78 +79,95 @@ class Map:
         return copysign((a * (cls.AIR_RESISTANCE * v**2) / 2), v)
 
     def __init__(self):
+        # Lazy import so the pack compiler can be run as a module without being imported twice
+        from .pack import MapPack
+
         storage = Map.storage()
 
-        self.map_data = json.loads((storage / "start.json").read_text())
-        texture = pygame.image.load(storage / "start.png")
+        pack_path = storage.with_suffix(".pack")
+        if pack_path.is_file() and not MapPack.is_stale(pack_path, storage):
+            pack = MapPack(pack_path)
+            segment_names = [name for name in pack.segments if name[0].isdigit()]
+        else:
+            if pack_path.is_file():
+                logger.warning(f"Map pack {pack_path} is older than its segments, loading from JSON instead.")
+            pack = None
+            segment_names = sorted({f.stem for f in storage.iterdir() if f.is_file() and f.stem[0].isdigit()})
+
+        def load_segment(name: str, flip: bool) -> tuple[Segment, pygame.Surface]:
+            if pack is None:
+                texture = pygame.image.load(storage / f"{name}.png")
+                segment = Segment.from_dict(json.loads((storage / f"{name}.json").read_text()), name)
+                if flip:
+                    segment.flip(texture.width)
+            else:
+                texture = pack.texture(name)
+                segment = pack.segment(name, flip)
+
+            if flip:
+                texture = pygame.transform.flip(texture, True, False)
+            return segment, texture
+
+        self.map_data, texture = load_segment("start", False)
+        if self.map_data.spawn is None or self.map_data.init_dir is None or self.map_data.init_weapon_pos is None:
+            raise ValueError("Start segment must have a spawn, init_dir and init_weapon_pos")
         self.width: int = texture.width
         textures = [texture]
 
         i = 0
         segments = random.randint(4, 8)
-        while i < segments or "gates" not in self.map_data:
-            segment = random.choice([f for f in storage.iterdir() if f.is_file() and f.stem[0].isdigit()]).stem
-            texture = pygame.image.load(storage / f"{segment}.png")
-            flip = random.random() < 0.5
-            if flip:
-                texture = pygame.transform.flip(texture, True, False)
+        while i < segments or not self.map_data.gates:
+            segment, texture = load_segment(random.choice(segment_names), random.random() < 0.5)
             textures.append(texture)
-
-            map_data = json.loads((storage / f"{segment}.json").read_text())
-            for prop in map_data:
-                for obj in map_data[prop]:
-                    if flip:
-                        obj["bounds"][0] = texture.width - obj["bounds"][0] - obj["bounds"][2]
-                    obj["bounds"][0] += self.width
-                    if prop not in self.map_data:
-                        self.map_data[prop] = []
-                    self.map_data[prop].append(obj)
-
+            self.map_data.extend(segment, self.width)
             self.width += texture.width
             i += 1
 
-        # To simple namespace for dot access
-        self.map_data = json.loads(json.dumps(self.map_data), object_hook=lambda d: SimpleNamespace(**d))
+        if pack is not None:
+            pack.close()
 
         # FIXME temp, change when have generated underground
         self.static_bg = False
         if self.static_bg:
-            self.texture = pygame.Surface(texture.size).convert()
-            self.texture.fill(self.map_data.background)
-            self.texture.blit(texture, (0, 0))
+            surface = pygame.Surface(texture.size).convert()
+            surface.fill(self.map_data.background)
+            surface.blit(texture, (0, 0))
         else:
             self.background: Background = Background()
-            self.texture = pygame.Surface((self.width, textures[0].height), pygame.SRCALPHA).convert_alpha()
+            surface = pygame.Surface((self.width, textures[0].height), pygame.SRCALPHA).convert_alpha()
             off = 0
             for texture in textures:
-                self.texture.blit(texture, (off, 0))
+                surface.blit(texture, (off, 0))
                 off += texture.width
 
             # Bottom gradient
             surf = pygame.Surface((1, 2), pygame.SRCALPHA)
             pygame.draw.line(surf, (0, 0, 0), (0, 1), (1, 1))
             surf = pygame.transform.smoothscale(surf, (self.width, 500))
-            self.texture.blit(surf, (0, self.texture.height - surf.height))
+            surface.blit(surf, (0, surface.height - surf.height))
 
         # def gen_c() -> int:
         #     return random.randint(50, 255 // max(1, state.difficulty / 100))
 
         # tint = gen_c(), gen_c(), gen_c()
-        # self.texture.fill(tint, special_flags=pygame.BLEND_MULT)
+        # surface.fill(tint, special_flags=pygame.BLEND_MULT)
         # if self.static_bg:
-        #     self.background: str = self.texture.get_at((0, 0))
+        #     self.background: str = surface.get_at((0, 0))
+
+        self.width: int = surface.width
+        self.height: int = surface.height
 
-        self.width: int = self.texture.width
-        self.height: int = self.texture.height
-        self.cell_size: int = min(self.width, self.height) // 10
+        # Most of the texture is either empty or opaque, so only blend the parts which need it
+        self.texture: SplitTexture = SplitTexture(surface)
+        logger.debug(f"Split map texture into tiles: {self.texture.counts}")
+        # Only a starting point, the cell size is picked once the map is loaded
+        self.cell_size: int = self.CELL_SIZE or min(self.width, self.height) // 10
 
         # Reset player to default values, move to spawn and change facing to init dir
         state.player.to_default_values(*self.map_data.spawn, Side(self.map_data.init_dir))
         state.camera.instant_center()
 
-        self.rows: int = ceil(self.height / self.cell_size) + 1
-        self.cols: int = ceil(self.width / self.cell_size) + 1
-        self.grid: Grid = [None] * self.rows
+        self.broadphase: Broadphase = SpatialGrid(self.width, self.height, self.cell_size)
 
         self.objects: set[Box] = set()
         self.walls: set[Wall] = set()
@@ -149,6 +176,17 @@ class Map:
         self.gates: set[Gate] = set()
         self.damage_numbers: set[DamageNumber] = set()
 
+        # How many times clients of each layer have been added or removed, by layer value
+        self.generations: dict[int, int] = {layer.value: 0 for layer in Layer}
+        # Query results by (rect, layer mask, precision), with the generation of the layer mask they were made at. In
+        # order of use, least recently used first
+        self.query_cache: OrderedDict[tuple[float, float, int, int, int, bool], tuple[int, set[Box]]] = OrderedDict()
+        # Queries answered from the query cache and queries which had to search the broadphase
+        self.query_hits: int = 0
+        self.query_misses: int = 0
+        # The velocities of all enemies, pickups and damage numbers
+        self.physics: PhysicsWorld = PhysicsWorld(Map.GRAVITY, Map.AIR_RESISTANCE)
+
         # Lazy load enemy and weapon classes because cyclical imports
         global ENEMIES
         if ENEMIES is None:
@@ -166,25 +204,40 @@ class Map:
         tick_bounds = state.camera.active_bounds
         to_remove = set()
 
-        for enemy in self.get_rect(*tick_bounds, lambda e: e in self.enemies):
-            self._remove(enemy, False)
+        enemies = self.get_rect(*tick_bounds, layers=Layer.ENEMY)
+        # Dead enemies don't move
+        self.physics.step(dt, [enemy for enemy in enemies if not enemy.dead])
+        for enemy in enemies:
+            # Sleeping and dead enemies aren't moved, so they can stay in the broadphase
+            moves = not (enemy.asleep or enemy.dead)
+            if moves:
+                self._remove(enemy, False)
             enemy.tick(dt)
             # Kill if out of map, TODO animation
             if enemy.top > self.height or enemy.death_finished:
+                if not moves:
+                    self._remove(enemy, False)
                 to_remove.add(enemy)
             else:
-                self._add(enemy, False)
+                if moves:
+                    self._add(enemy, False)
                 if enemy.dead:
                     enemy.drop_loot()
 
         for enemy in to_remove:
             self.objects.remove(enemy)
             self.enemies.remove(enemy)
+            self.physics.remove(enemy)
 
-        for pickup in self.get_rect(*tick_bounds, lambda e: e in self.pickups):
-            self._remove(pickup, False)
-            pickup.tick(dt)
-            self._add(pickup, False)
+        pickups = self.get_rect(*tick_bounds, layers=Layer.PICKUP)
+        self.physics.step(dt, pickups + list(self.damage_numbers))
+        for pickup in pickups:
+            if pickup.asleep:
+                pickup.tick(dt)  # Only animates
+            else:
+                self._remove(pickup, False)
+                pickup.tick(dt)
+                self._add(pickup, False)
 
         to_remove = set()
         for dm in self.damage_numbers:
@@ -197,6 +250,7 @@ class Map:
         for dm in to_remove:
             self.objects.remove(dm)
             self.damage_numbers.remove(dm)
+            self.physics.remove(dm)
 
     def player_out_of_bounds(self) -> None:
         # Damages player by 1/5 max health
@@ -239,7 +293,8 @@ class Map:
                 wall.y - state.player.HEIGHT,
                 wall.width,
                 state.player.HEIGHT,  # Use max height, not current cause all actions are interrupted
-                lambda e: e is not wall and e in self.walls or e in self.enemies,
+                lambda e: e is not wall,
+                layers=Layer.WALL | Layer.ENEMY,
             )
 
             # Get available positions to spawn
@@ -259,88 +314,114 @@ class Map:
                 state.player.center_x = pos
                 # Return if found suitable position (no walls colliding + no enemies in safe range)
                 if not (
-                    self.get_rect(*state.player, lambda e: e is not wall and e in self.walls)
+                    self.any_in_rect(*state.player, lambda e: e is not wall, layers=Layer.WALL)
                     or (
                         check_enemies
-                        and self.get_rect(
+                        and self.any_in_rect(
                             state.player.x - Map.SAFE_RANGE,
                             state.player.y - Map.SAFE_RANGE,
                             state.player.width + Map.SAFE_RANGE * 2,
                             state.player.height + Map.SAFE_RANGE * 2,
-                            lambda e: e is not entity and e in self.enemies and not e.dead,
+                            lambda e: e is not entity and not e.dead,
+                            layers=Layer.ENEMY,
                         )
                     )
                 ):
                     return
 
-    def _to_cells(self, x: float, y: float, width: int, height: int) -> tuple[int, int, int, int]:
-        """Converts the given rectangle to the cell coordinates of each side (left, top, right, bottom).
-
-        Parameters
-        ----------
-        x : float
-            The left-most x coordinate of the rectangle.
-        y : float
-            The top-most y coordinate of the rectangle.
-        width : int
-            The width of the rectangle.
-        height : int
-            The height of the rectangle.
-
-        Returns
-        -------
-        tuple of int
-            The coordinates of the left-most cell, top-most cell, right-most cell and bottom-most cell as a tuple.
-        """
-
-        return (
-            floor(x / self.cell_size),
-            floor(y / self.cell_size),
-            ceil((x + width) / self.cell_size),
-            ceil((y + height) / self.cell_size),
-        )
-
     def load(self) -> None:
         start = time.process_time()
 
-        gates = [
-            gate
-            for gate in self.map_data.gates
-            if not hasattr(gate, "optional") or not gate.optional or random.random() < 0.5
-        ]
+        gates = [gate for gate in self.map_data.gates if not gate.optional or random.random() < 0.5]
 
-        def get_progress(wall) -> float:
-            return (wall.bounds[2] * wall.bounds[3]) / 10000 + getattr(wall, "enemies", 0) * (1 + state.difficulty / 10)
+        def get_progress(spec: BoundsSpec, enemies: int = 0) -> float:
+            return spec.area / 10000 + enemies * (1 + state.difficulty / 10)
 
-        total_progress = sum(map(get_progress, self.map_data.walls + gates))
-        if hasattr(self.map_data, "platforms"):
-            total_progress += sum(map(get_progress, self.map_data.platforms))
+        total_progress = (
+            sum(get_progress(wall, wall.enemies or 0) for wall in self.map_data.walls)
+            + sum(map(get_progress, self.map_data.platforms))
+            + sum(map(get_progress, gates))
+        )
 
         state.loading_progress = 0
 
         for wall in self.map_data.walls:
             box = Wall(*wall.bounds)
             self.add_wall(box)
-            if hasattr(wall, "enemies"):
+            if wall.enemies is not None:
                 # Random amount of enemies + more with higher difficulty
                 for _ in range(floor(wall.enemies * random.uniform(0.8, 1.2) * (1 + state.difficulty / 10))):
                     self.spawn_enemy(box)
                 # Random chance to spawn a corpse which weapons drop from
                 if random.random() < 0.2:
                     self.add(Corpse(box))
-            state.loading_progress += get_progress(wall) / total_progress
+            state.loading_progress += get_progress(wall, wall.enemies or 0) / total_progress
 
-        if hasattr(self.map_data, "platforms"):
-            for platform in self.map_data.platforms:
-                self.add_wall(Platform(*platform.bounds))
-                state.loading_progress += get_progress(platform) / total_progress
+        for platform in self.map_data.platforms:
+            self.add_wall(Platform(*platform.bounds))
+            state.loading_progress += get_progress(platform) / total_progress
 
         for gate in gates:
             self.add_gate(Gate(*gate.bounds))
             state.loading_progress += get_progress(gate) / total_progress
 
+        self._pick_cell_size()
+
         logger.info(f"Done loading map: took {(time.process_time() - start)*1000}ms")
 
+    def _pick_cell_size(self) -> None:
+        """Picks the cell size of the broadphase from the loaded clients and the queries made each tick.
+
+        The cell size is only picked if not overridden by :attr:`CELL_SIZE`, but the diagnostic is logged either way.
+        """
+
+        camera = state.camera
+        player = state.player
+        active_width = min(self.width, camera.width + camera.ACTIVE_AREA * 2)
+        active_height = min(self.height, camera.height + camera.ACTIVE_AREA * 2)
+        padding = player.NEIGHBOURHOOD_PADDING
+        queries = {
+            "viewport": (camera.width, camera.height, 1),
+            "active area": (active_width, active_height, 2),  # Enemies and pickups
+            "player neighbourhood": (player.width + padding * 2, player.height + padding * 2, 1),
+        }
+        moves = {}
+
+        if self.enemies:
+            # Only enemies in the active area are ticked
+            active = len(self.enemies) * min(1, active_width * active_height / (self.width * self.height))
+            width = median(e.width for e in self.enemies)
+            height = median(e.height for e in self.enemies)
+            queries["enemy sense"] = (
+                median(e.sense_width for e in self.enemies),
+                median(e.sense_height for e in self.enemies),
+                active,
+            )
+            queries["enemy move"] = width, height, active * 2
+            moves["enemies"] = width, height, active
+
+        model = CellSizeModel(self.width, self.height, self.objects, queries, moves)
+        cell_size = self.CELL_SIZE or model.best()
+        logger.info(f"Broadphase {model.describe(cell_size)}")
+        if cell_size != self.cell_size:
+            logger.debug(f"Replacing default broadphase {model.describe(self.cell_size)}")
+            self.set_cell_size(cell_size)
+
+    def set_cell_size(self, cell_size: int) -> None:
+        """Rebuilds the broadphase of this map with the given cell size.
+
+        Parameters
+        ----------
+        cell_size : int
+            The new cell size.
+        """
+
+        self.cell_size = cell_size
+        self.broadphase = SpatialGrid(self.width, self.height, cell_size)
+        for box in self.objects:
+            self.broadphase.add(box)
+        self.query_cache.clear()
+
     def add_damage_number(self, dm: DamageNumber) -> None:
         self.damage_numbers.add(dm)
         self.add(dm)
@@ -366,15 +447,18 @@ class Map:
 
     def remove(self, box: Box) -> None:
         self._remove(box, True)
+        if isinstance(box, Body):
+            self.physics.remove(box)
+        elif box.LAYER is Layer.WALL:
+            # Anything resting on it has to fall
+            for body in self.get_rect(box.x, box.y - 1, box.width, 2, layers=Layer.ENEMY | Layer.PICKUP):
+                body.wake()
 
     def _remove(self, box: Box, remove_from_list: bool) -> None:
         if remove_from_list:
             self.objects.remove(box)
-        start_col, start_row, end_col, end_row = self._to_cells(*box)
-        for row in range(start_row, end_row + 1):
-            for col in range(start_col, end_col + 1):
-                if row >= 0 and row < self.rows and col >= 0 and col < self.cols:
-                    self.grid[row][col].remove(box)
+        self.generations[box.LAYER.value] += 1
+        self.broadphase.remove(box)
 
     def add_pickups(self, pickups: list[Pickup]) -> None:
         for pickup in pickups:
@@ -390,9 +474,11 @@ class Map:
 
     def add(self, box: Box) -> None:
         self._add(box, True)
+        if isinstance(box, Body):
+            self.physics.add(box)
 
     def _add(self, box: Box, add_to_list: bool) -> None:
-        """Adds the given box to all cells in this map that intersect it.
+        """Adds the given box to this map's broadphase.
 
         This method also adds the given box to this map's objects set.
 
@@ -406,38 +492,25 @@ class Map:
 
         if add_to_list:
             self.objects.add(box)
-        start_col, start_row, end_col, end_row = self._to_cells(*box)
-        for row in range(start_row, end_row + 1):
-            for col in range(start_col, end_col + 1):
-                self._add_to_cell(box, row, col)
+        self.generations[box.LAYER.value] += 1
+        self.broadphase.add(box)
 
-    def _add_to_cell(self, client: Box, row: int, col: int) -> None:
-        """Inserts a client (Box) into this map's spatial grid at the given position.
-
-        This method should only be called from add_box().
-
-        See Also
-        --------
-        add_box()
+    def get_generation(self, layers: int) -> int:
+        """Gets the generation of the given layers, which changes whenever a client on any of them is added or removed.
 
         Parameters
         ----------
-        client : Box
-            The client to insert into the map.
-        row : int
-            The row to insert the client into.
-        col : int
-            The column to insert the client into.
-        """
+        layers : int
+            The layer mask.
 
-        if row < 0 or row >= self.rows or col < 0 or col >= self.cols:
-            return
+        Returns
+        -------
+        int
+            The generation of the layers.
+        """
 
-        if self.grid[row] is None:
-            self.grid[row] = [None] * self.cols
-        if self.grid[row][col] is None:
-            self.grid[row][col] = set()
-        self.grid[row][col].add(client)
+        # Each generation only increases, so the sum only stays the same if none of them changed
+        return sum(generation for layer, generation in self.generations.items() if layer & layers)
 
     def get_rect(
         self,
@@ -447,9 +520,15 @@ class Map:
         height: int,
         filter_fn: Callable[[Box], bool] = None,
         precision: bool = True,
+        layers: Layer = Layer.ALL,
+        cached: bool = False,
     ) -> list[Box]:
         """Fetches all clients in this map within the given rectangle.
 
+        Cached results are kept by the rectangle and layers until a client on one of the layers is added or removed,
+        so passing only the layers needed lets a query stay cached while other layers change. Only worth it for a
+        rectangle that is queried again and again, like the camera viewport.
+
         Parameters
         ----------
         x : float
@@ -464,6 +543,10 @@ class Map:
             A function to filter for specific clients.
         precision : bool, default True
             Whether to check for precise bounds or just use spatial hash columns
+        layers : Layer, default Layer.ALL
+            The layers to search.
+        cached : bool, default False
+            Whether to use the query cache.
 
         Returns
         -------
@@ -471,66 +554,127 @@ class Map:
             A list of clients in this map within the given rectangle.
         """
 
-        clients = set()
-        s_col, s_row, e_col, e_row = self._to_cells(x, y, width, height)
-        if s_row < 0:
-            s_row = 0
-        if e_row >= self.rows:
-            e_row = self.rows
-        if s_col < 0:
-            s_col = 0
-        if e_col >= self.cols:
-            e_col = self.cols
-
-        for row in range(s_row, e_row):
-            if self.grid[row] is not None:
-                for col in range(s_col, e_col):
-                    cell = self.grid[row][col]
-                    if cell is not None:
-                        if precision:
-                            for c in cell:
-                                if x < c.right and x + width > c.left and y < c.bottom and y + height > c.top:
-                                    clients.add(c)
-                        else:
-                            clients |= cell
-
-        return list(filter(filter_fn, clients)) if callable(filter_fn) else clients
+        layers = layers.value
+        if cached and Map.QUERY_CACHE_SIZE > 0:
+            key = x, y, width, height, layers, precision
+            generation = self.get_generation(layers)
+            entry = self.query_cache.get(key)
+            if entry is not None and entry[0] == generation:
+                clients = entry[1]
+                self.query_cache.move_to_end(key)
+                self.query_hits += 1
+            else:
+                clients = self.broadphase.query(x, y, width, height, precision, layers)
+                self.query_misses += 1
+                if entry is not None:
+                    del self.query_cache[key]  # Stale, replaced as the most recently used
+                elif len(self.query_cache) >= Map.QUERY_CACHE_SIZE:
+                    self.query_cache.popitem(last=False)
+                self.query_cache[key] = generation, clients
+        else:
+            clients = self.broadphase.query(x, y, width, height, precision, layers)
+
+        return list(filter(filter_fn, clients)) if callable(filter_fn) else list(clients)
+
+    def iter_rect(
+        self,
+        x: float,
+        y: float,
+        width: int,
+        height: int,
+        filter_fn: Callable[[Box], bool] = None,
+        layers: Layer = Layer.ALL,
+    ) -> Iterator[Box]:
+        """Lazily yields the clients in this map within the given rectangle.
+
+        Unlike :meth:`get_rect`, nothing is collected or cached, so stopping early skips the rest of the search.
+
+        The map must not be changed while iterating.
+
+        Parameters
+        ----------
+        x : float
+            The left-most x coordinate of the rectangle to search in.
+        y : float
+            The top-most y coordinate of the rectangle to search in.
+        width : int
+            The width of the rectangle to search in.
+        height : int
+            The height of the rectangle to search in.
+        filter_fn : callable with parameters [Box] and return bool, optional
+            A function to filter for specific clients.
+        layers : Layer, default Layer.ALL
+            The layers to search.
+
+        Returns
+        -------
+        iterator of Box
+            The clients in this map within the given rectangle.
+        """
+
+        return self.broadphase.iter(x, y, width, height, filter_fn, layers.value)
+
+    def any_in_rect(
+        self,
+        x: float,
+        y: float,
+        width: int,
+        height: int,
+        filter_fn: Callable[[Box], bool] = None,
+        layers: Layer = Layer.ALL,
+    ) -> bool:
+        """Checks if there are any clients in this map within the given rectangle, stopping at the first.
+
+        See Also
+        --------
+        iter_rect()
+        """
+
+        return next(self.iter_rect(x, y, width, height, filter_fn, layers), None) is not None
+
+    def first_in_rect(
+        self,
+        x: float,
+        y: float,
+        width: int,
+        height: int,
+        filter_fn: Callable[[Box], bool] = None,
+        layers: Layer = Layer.ALL,
+    ) -> Box | None:
+        """Gets a client in this map within the given rectangle, or None if there are none.
+
+        See Also
+        --------
+        iter_rect()
+        """
+
+        return next(self.iter_rect(x, y, width, height, filter_fn, layers), None)
+
+    def count_in_rect(
+        self,
+        x: float,
+        y: float,
+        width: int,
+        height: int,
+        filter_fn: Callable[[Box], bool] = None,
+        layers: Layer = Layer.ALL,
+    ) -> int:
+        """Counts the clients in this map within the given rectangle without collecting them.
+
+        See Also
+        --------
+        iter_rect()
+        """
+
+        return sum(1 for _ in self.iter_rect(x, y, width, height, filter_fn, layers))
 
     def get_nearest(self, x: float, y: float, filter_fn: type[Box] = None, max_depth: int = -1) -> Box | None:
-        col = floor(x / self.cell_size)
-        row = floor(y / self.cell_size)
-
-        depth_cap = max(col, row, self.cols - col, self.rows - row)
-        if max_depth < 0 or max_depth > depth_cap:
-            max_depth = depth_cap
-
-        depth = 1
-        nearest = None
-        nearest_d_sq = -1
-        while nearest is None and depth <= max_depth:
-            for i in range(-depth, depth + 1):
-                r = row + i
-                if r >= 0 and r < self.rows and self.grid[r] is not None:
-                    for j in range(-depth, depth + 1):
-                        if abs(i) >= depth or abs(j) >= depth:
-                            c = col + j
-                            if c >= 0 and c < self.cols:
-                                cell = self.grid[r][c]
-                                if cell is not None:
-                                    for client in filter(filter_fn, cell) if callable(filter_fn) else cell:
-                                        d_sq = (client.center_x - x) ** 2 + (client.center_y - y) ** 2
-                                        if nearest_d_sq < 0 or d_sq < nearest_d_sq:
-                                            nearest = client
-                                            nearest_d_sq = d_sq
-
-            depth += 1
-
-        return nearest
+        return self.broadphase.nearest(x, y, filter_fn, max_depth)
 
     def add_wall(self, wall: Wall) -> None:
         """Adds the given wall into this map.
 
-        This adds the wall to the walls array and the grid.
+        This adds the wall to the walls array and the broadphase.
 
         Parameters
         ----------
@@ -0,0 +1,281 @@
+"""Compiled level segment packs.
+
+A pack holds every segment of a biome (``assets/maps/<biome>``) in a single file so maps can be built without parsing
+JSON or opening a file per segment. Compile a biome with ``python -m map.pack ../assets/maps/<biome>`` from ``src``,
+which writes ``assets/maps/<biome>.pack`` next to the biome folder.
+
+Layout (little endian)::
+
+    header    magic, version, segment count
+    index     one fixed size record per segment (name, texture size and offset, geometry offsets, start fields)
+    data      geometry blocks (both flip variants), lore strings and png texture payloads
+"""
+
+from __future__ import annotations
+
+import io
+import json
+import logging
+import mmap
+import struct
+from argparse import ArgumentParser
+from collections.abc import Iterator
+from pathlib import Path
+
+import pygame
+
+from .schema import GateSpec, LoreSpec, PlatformSpec, Segment, WallSpec
+
+logger = logging.getLogger(__name__)
+
+MAGIC: bytes = b"NSDCPACK"
+VERSION: int = 2
+
+HEADER = struct.Struct("<8sHI")  # Magic, version, segment count
+# Name, width, height, texture offset, texture length, geometry offsets (normal, flipped), flags, spawn, init dir,
+# init weapon pos
+SEGMENT = struct.Struct("<32sIIQQQQB2ib2i")
+COUNTS = struct.Struct("<4I")  # Walls, platforms, gates, lore
+WALL = struct.Struct("<4ii")  # Bounds, enemies (-1 if none)
+PLATFORM = struct.Struct("<4i")  # Bounds
+GATE = struct.Struct("<4i?")  # Bounds, optional
+LORE = struct.Struct("<4iQI")  # Bounds, text offset, text length
+
+HAS_SPAWN: int = 1
+HAS_INIT_DIR: int = 2
+HAS_INIT_WEAPON_POS: int = 4
+
+PNG_SIGNATURE: bytes = b"\x89PNG\r\n\x1a\n"
+
+
+def _png_size(data: bytes) -> tuple[int, int]:
+    """Reads the size of a png image from its header without decoding it.
+
+    Parameters
+    ----------
+    data : bytes
+        The png file contents.
+
+    Returns
+    -------
+    tuple of int
+        The width and height of the image.
+    """
+
+    if data[:8] != PNG_SIGNATURE or data[12:16] != b"IHDR":
+        raise ValueError("Not a png image")
+    return struct.unpack_from(">II", data, 16)
+
+
+def compile_biome(src: Path, dst: Path = None) -> Path:
+    """Compiles all segments (JSON and png pairs) in the given biome folder into a pack.
+
+    Parameters
+    ----------
+    src : Path
+        The biome folder, e.g. ``assets/maps/ramparts``.
+    dst : Path, optional
+        Where to write the pack. Defaults to the biome folder with a ``.pack`` suffix.
+
+    Returns
+    -------
+    Path
+        The path of the written pack.
+    """
+
+    if dst is None:
+        dst = src.with_suffix(".pack")
+
+    segments = sorted(f.stem for f in src.iterdir() if f.is_file() and f.suffix == ".json")
+    data_start = HEADER.size + SEGMENT.size * len(segments)
+
+    index = bytearray(HEADER.pack(MAGIC, VERSION, len(segments)))
+    data = bytearray()
+
+    for name in segments:
+        segment = Segment.from_dict(json.loads((src / f"{name}.json").read_text()), f"{src.name}/{name}")
+        texture = (src / f"{name}.png").read_bytes()
+        width, height = _png_size(texture)
+
+        # Lore text is shared between both flip variants
+        text_offsets = []
+        for lore in segment.lore:
+            text_offsets.append(data_start + len(data))
+            data += lore.text.encode()
+
+        geometry_offsets = []
+        for flip in False, True:
+            if flip:
+                segment.flip(width)
+
+            block = bytearray(
+                COUNTS.pack(len(segment.walls), len(segment.platforms), len(segment.gates), len(segment.lore))
+            )
+            for wall in segment.walls:
+                block += WALL.pack(*wall.bounds, -1 if wall.enemies is None else wall.enemies)
+            for platform in segment.platforms:
+                block += PLATFORM.pack(*platform.bounds)
+            for gate in segment.gates:
+                block += GATE.pack(*gate.bounds, gate.optional)
+            for lore, text_offset in zip(segment.lore, text_offsets):
+                block += LORE.pack(*lore.bounds, text_offset, len(lore.text.encode()))
+
+            geometry_offsets.append(data_start + len(data))
+            data += block
+
+        texture_offset = data_start + len(data)
+        data += texture
+
+        flags = (
+            (segment.spawn is not None and HAS_SPAWN)
+            | (segment.init_dir is not None and HAS_INIT_DIR)
+            | (segment.init_weapon_pos is not None and HAS_INIT_WEAPON_POS)
+        )
+        index += SEGMENT.pack(
+            name.encode(),
+            width,
+            height,
+            texture_offset,
+            len(texture),
+            *geometry_offsets,
+            flags,
+            *(segment.spawn or (0, 0)),
+            segment.init_dir or 0,
+            *(segment.init_weapon_pos or (0, 0)),
+        )
+
+    dst.write_bytes(index + data)
+    logger.info(f"Compiled {len(segments)} segments from {src} into {dst} ({len(index) + len(data)} bytes)")
+    return dst
+
+
+class MapPack:
+    """A read-only, memory mapped level segment pack.
+
+    Use as a context manager or call ``close()`` when done.
+    """
+
+    @staticmethod
+    def is_stale(pack: Path, src: Path) -> bool:
+        """Whether the given pack is older than any of the segment files it was compiled from.
+
+        Parameters
+        ----------
+        pack : Path
+            The pack to check.
+        src : Path
+            The biome folder the pack was compiled from.
+
+        Returns
+        -------
+        bool
+            If the pack should be recompiled.
+        """
+
+        pack_mtime = pack.stat().st_mtime
+        return any(f.stat().st_mtime > pack_mtime for f in src.iterdir() if f.suffix in (".json", ".png"))
+
+    def __init__(self, path: Path):
+        with path.open("rb") as f:
+            self._data: mmap.mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, version, count = HEADER.unpack_from(self._data)
+        if magic != MAGIC or version != VERSION:
+            self.close()
+            raise ValueError(f"Invalid or outdated map pack: {path}")
+
+        self.segments: dict[str, tuple] = {}
+        for i in range(count):
+            record = SEGMENT.unpack_from(self._data, HEADER.size + SEGMENT.size * i)
+            self.segments[record[0].rstrip(b"\0").decode()] = record[1:]
+
+    def __enter__(self) -> MapPack:
+        return self
+
+    def __exit__(self, *_) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self._data.close()
+
+    def texture(self, name: str) -> pygame.Surface:
+        """Loads the (unflipped) texture of the given segment.
+
+        Parameters
+        ----------
+        name : str
+            The name of the segment.
+
+        Returns
+        -------
+        pygame.Surface
+            The segment's texture.
+        """
+
+        _, _, offset, length, *_ = self.segments[name]
+        return pygame.image.load(io.BytesIO(self._data[offset : offset + length]), "png")
+
+    def _unpack(self, record: struct.Struct, offset: int, count: int) -> Iterator[tuple]:
+        return record.iter_unpack(self._data[offset : offset + record.size * count])
+
+    def segment(self, name: str, flip: bool = False) -> Segment:
+        """Builds the given segment from its packed geometry.
+
+        Parameters
+        ----------
+        name : str
+            The name of the segment.
+        flip : bool, default = False
+            Whether to use the horizontally flipped variant.
+
+        Returns
+        -------
+        Segment
+            The segment.
+        """
+
+        _, _, _, _, normal, flipped, flags, sx, sy, init_dir, wx, wy = self.segments[name]
+
+        offset = flipped if flip else normal
+        num_walls, num_platforms, num_gates, num_lore = COUNTS.unpack_from(self._data, offset)
+        offset += COUNTS.size
+
+        walls = [
+            WallSpec(x, y, width, height, None if enemies < 0 else enemies)
+            for x, y, width, height, enemies in self._unpack(WALL, offset, num_walls)
+        ]
+        offset += WALL.size * num_walls
+
+        platforms = [PlatformSpec(*bounds) for bounds in self._unpack(PLATFORM, offset, num_platforms)]
+        offset += PLATFORM.size * num_platforms
+
+        gates = [GateSpec(*gate) for gate in self._unpack(GATE, offset, num_gates)]
+        offset += GATE.size * num_gates
+
+        lore = [
+            LoreSpec(*bounds, self._data[text_offset : text_offset + length].decode())
+            for *bounds, text_offset, length in self._unpack(LORE, offset, num_lore)
+        ]
+
+        return Segment(
+            walls,
+            platforms,
+            gates,
+            lore,
+            (sx, sy) if flags & HAS_SPAWN else None,
+            init_dir if flags & HAS_INIT_DIR else None,
+            (wx, wy) if flags & HAS_INIT_WEAPON_POS else None,
+        )
+
+
+if __name__ == "__main__":
+    parser = ArgumentParser(description="Compiles level segment folders into map packs.")
+    parser.add_argument("biomes", type=Path, nargs="+", help="biome folders to compile, e.g. assets/maps/ramparts")
+    parser.add_argument("-o", "--output", type=Path, help="output path (only valid with a single biome)")
+    args = parser.parse_args()
+
+    if args.output is not None and len(args.biomes) > 1:
+        parser.error("--output can only be used with a single biome")
+
+    for biome in args.biomes:
+        print(f"Compiled {biome} -> {compile_biome(biome, args.output)}")
@@ -0,0 +1,239 @@
+from __future__ import annotations
+
+from collections.abc import Iterable
+
+import numpy as np
+
+
+class Body:
+    """Mixin for boxes whose velocity is integrated by a :class:`PhysicsWorld`, instead of by each box.
+
+    While the body is in a world its velocity lives in the world's arrays, otherwise it lives on the body, so the
+    velocity can be set before the body is added to a map. The collisions are still resolved by each box.
+
+    A body resting on a platform can be put to sleep, so the world and the map skip moving it. Giving it any velocity
+    wakes it up.
+    """
+
+    # Whether gravity pulls this body down
+    FALLS: bool = True
+
+    _world: PhysicsWorld | None = None
+    _body_index: int = -1
+    _vx: float = 0
+    _vy: float = 0
+    _on_platform: bool = False
+    _asleep: bool = False
+
+    @property
+    def vx(self) -> float:
+        if self._world is None:
+            return self._vx
+        return float(self._world.vx[self._body_index])
+
+    @vx.setter
+    def vx(self, value: float) -> None:
+        if self._world is None:
+            self._vx = value
+        else:
+            self._world.vx[self._body_index] = value
+        if value:
+            self.wake()
+
+    @property
+    def vy(self) -> float:
+        if self._world is None:
+            return self._vy
+        return float(self._world.vy[self._body_index])
+
+    @vy.setter
+    def vy(self, value: float) -> None:
+        if self._world is None:
+            self._vy = value
+        else:
+            self._world.vy[self._body_index] = value
+        if value:
+            self.wake()
+
+    @property
+    def on_platform(self) -> bool:
+        """Whether this body is resting on a platform, i.e. slowed by friction."""
+
+        if self._world is None:
+            return self._on_platform
+        return bool(self._world.on_platform[self._body_index])
+
+    @on_platform.setter
+    def on_platform(self, value: bool) -> None:
+        if self._world is None:
+            self._on_platform = value
+        else:
+            self._world.on_platform[self._body_index] = value
+
+    @property
+    def asleep(self) -> bool:
+        """Whether this body is at rest, so forces aren't applied to it and it isn't moved."""
+
+        if self._world is None:
+            return self._asleep
+        return bool(self._world.asleep[self._body_index])
+
+    def sleep(self) -> None:
+        if self._world is None:
+            self._asleep = True
+        else:
+            self._world.asleep[self._body_index] = True
+
+    def wake(self) -> None:
+        if self._world is None:
+            self._asleep = False
+        else:
+            self._world.asleep[self._body_index] = False
+
+    @property
+    def drag_areas(self) -> tuple[float, float]:
+        """The surface areas facing horizontal and vertical movement, for air resistance."""
+        return self.height, self.width
+
+    @property
+    def grip(self) -> float:
+        """The friction of this body on a platform before gravity, i.e. mass times the friction coefficient."""
+        return 0
+
+
+class PhysicsWorld:
+    """Integrates the forces on many bodies at once, storing each property of every body in one array.
+
+    Bodies are packed at the start of the arrays in the order they were added, removing a body moves the last body into
+    its place. The arrays double in size when full.
+
+    Parameters
+    ----------
+    gravity : float
+        The acceleration due to gravity (px/s^2).
+    air_resistance : float
+        The air resistance coefficient, see :meth:`map.Map.get_air_resistance`.
+    """
+
+    INITIAL_CAPACITY: int = 64
+
+    # The names of the arrays, one element per body
+    FIELDS: tuple[str, ...] = ("vx", "vy", "on_platform", "asleep", "area_x", "area_y", "fall", "grip")
+
+    def __init__(self, gravity: float, air_resistance: float):
+        self.gravity: float = gravity
+        self.air_resistance: float = air_resistance
+        self.bodies: list[Body] = []
+
+        capacity = PhysicsWorld.INITIAL_CAPACITY
+        self.vx: np.ndarray = np.zeros(capacity)
+        self.vy: np.ndarray = np.zeros(capacity)
+        self.on_platform: np.ndarray = np.zeros(capacity, dtype=bool)
+        self.asleep: np.ndarray = np.zeros(capacity, dtype=bool)
+        self.area_x: np.ndarray = np.zeros(capacity)
+        self.area_y: np.ndarray = np.zeros(capacity)
+        self.fall: np.ndarray = np.zeros(capacity)  # 1 if falls, else 0
+        self.grip: np.ndarray = np.zeros(capacity)
+
+    def add(self, body: Body) -> None:
+        """Adds a body to this world, moving its velocity into this world's arrays.
+
+        Parameters
+        ----------
+        body : Body
+            The body to add. It must not be in a world already.
+        """
+
+        i = len(self.bodies)
+        if i == len(self.vx):
+            self._grow()
+
+        self.vx[i] = body._vx
+        self.vy[i] = body._vy
+        self.on_platform[i] = body._on_platform
+        self.asleep[i] = body._asleep
+        self.area_x[i], self.area_y[i] = body.drag_areas
+        self.fall[i] = 1 if body.FALLS else 0
+        self.grip[i] = body.grip
+
+        self.bodies.append(body)
+        body._world = self
+        body._body_index = i
+
+    def remove(self, body: Body) -> None:
+        """Removes a body from this world, moving its velocity back onto the body.
+
+        Parameters
+        ----------
+        body : Body
+            The body to remove. It must be in this world.
+        """
+
+        i = body._body_index
+        body._vx = float(self.vx[i])
+        body._vy = float(self.vy[i])
+        body._on_platform = bool(self.on_platform[i])
+        body._asleep = bool(self.asleep[i])
+        body._world = None
+        body._body_index = -1
+
+        # Fill the hole with the last body
+        last = self.bodies.pop()
+        if last is not body:
+            j = len(self.bodies)
+            for name in PhysicsWorld.FIELDS:
+                array = getattr(self, name)
+                array[i] = array[j]
+            self.bodies[i] = last
+            last._body_index = i
+
+    def step(self, dt: float, bodies: Iterable[Body]) -> None:
+        """Applies gravity, air resistance and friction to the velocities of the given bodies.
+
+        Like :meth:`map.Map.get_air_resistance`, air resistance is proportional to the velocity squared. Friction is
+        only applied to bodies on a platform. Neither can reverse a body's horizontal velocity. Sleeping bodies are
+        skipped.
+
+        Parameters
+        ----------
+        dt : float
+            The time between this tick and the last tick in seconds.
+        bodies : iterable of Body
+            The bodies to update, all in this world.
+        """
+
+        index = np.fromiter((body._body_index for body in bodies), dtype=np.intp)
+        index = index[~self.asleep[index]]
+        if not index.size:
+            return
+
+        vx = self.vx[index]
+        vy = self.vy[index]
+        drag = self.air_resistance / 2
+
+        force = (
+            self.area_x[index] * drag * vx * np.abs(vx)
+            + np.sign(vx) * self.gravity * self.grip[index] * self.on_platform[index]
+        ) * dt
+        self.vx[index] = np.where(np.abs(force) > np.abs(vx), 0, vx - force)
+        self.vy[index] = vy + (self.fall[index] * self.gravity - self.area_y[index] * drag * vy * np.abs(vy)) * dt
+
+    def count_asleep(self) -> int:
+        return int(np.count_nonzero(self.asleep[: len(self.bodies)]))
+
+    def _grow(self) -> None:
+        capacity = len(self.vx) * 2
+        for name in PhysicsWorld.FIELDS:
+            array = getattr(self, name)
+            grown = np.zeros(capacity, dtype=array.dtype)
+            grown[: len(array)] = array
+            setattr(self, name, grown)
+
+    def __len__(self) -> int:
+        return len(self.bodies)
+
+    def __str__(self) -> str:
+        return (
+            f"{self.__class__.__name__} {{bodies={len(self.bodies)}, asleep={self.count_asleep()}, "
+            f"capacity={len(self.vx)}}}"
+        )
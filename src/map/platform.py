@@ -5,14 +5,15 @@ from .wall import Wall
 
 
 class Platform(Wall):
-    def detect_collision(self, left: float, top: float, right: float, bottom: float, player: bool = False) -> bool:
-        if player:
+    def blocks(self, box: Box) -> bool:
+        # The player can jump up through platforms and drop down through them
+        if box is state.player:
             if state.player.vy < 0:
                 state.player.should_not_collide.add(self)
                 return False
             if self in state.player.should_not_collide:
                 return False
-        return self.left < right and self.right > left and self.top < bottom and self.bottom > top
+        return True
 
     def detect_collision_box(self, box: Box) -> bool:
-        return self.detect_collision(box.left, box.top, box.right, box.bottom, box is state.player)
+        return self.blocks(box) and super().detect_collision_box(box)
@@ -0,0 +1,227 @@
+"""Typed level segment data.
+
+Segments are loaded from JSON files or map packs into these classes, which validate their fields when created from
+untrusted data so malformed segment files fail on load instead of somewhere in ``Map.load``.
+"""
+
+from __future__ import annotations
+
+from typing import Any
+
+from util.type import Rect, Vec2
+
+
+def _check_int(value: Any, name: str) -> int:
+    # Positions are in texture pixels, bool is a subclass of int so exclude explicitly
+    if isinstance(value, bool) or not isinstance(value, int):
+        raise ValueError(f"{name} must be an integer, got {value!r}")
+    return value
+
+
+def _check_point(value: Any, name: str) -> tuple[int, int]:
+    if not isinstance(value, (list, tuple)) or len(value) != 2:
+        raise ValueError(f"{name} must be a list of 2 integers, got {value!r}")
+    return _check_int(value[0], name), _check_int(value[1], name)
+
+
+def _check_keys(data: Any, required: set[str], optional: set[str], name: str) -> None:
+    if not isinstance(data, dict):
+        raise ValueError(f"{name} must be an object, got {data!r}")
+    if missing := required - data.keys():
+        raise ValueError(f"{name} is missing {', '.join(sorted(missing))}")
+    if unknown := data.keys() - required - optional:
+        raise ValueError(f"{name} has unknown fields {', '.join(sorted(unknown))}")
+
+
+class BoundsSpec:
+    """The bounds of an object in a segment."""
+
+    __slots__ = "x", "y", "width", "height"
+
+    @property
+    def bounds(self) -> Rect:
+        return self.x, self.y, self.width, self.height
+
+    @property
+    def area(self) -> float:
+        return self.width * self.height
+
+    def __init__(self, x: float, y: float, width: float, height: float):
+        self.x: float = x
+        self.y: float = y
+        self.width: float = width
+        self.height: float = height
+
+    @staticmethod
+    def _check_bounds(data: dict, name: str) -> Rect:
+        bounds = data["bounds"]
+        if not isinstance(bounds, (list, tuple)) or len(bounds) != 4:
+            raise ValueError(f"{name} bounds must be a list of 4 integers, got {bounds!r}")
+        x, y, width, height = (_check_int(v, f"{name} bounds") for v in bounds)
+        if width <= 0 or height <= 0:
+            raise ValueError(f"{name} bounds must have a positive size, got {bounds!r}")
+        return x, y, width, height
+
+    def flip(self, width: float) -> None:
+        """Mirrors this object horizontally in a segment of the given width."""
+        self.x = width - self.x - self.width
+
+
+class WallSpec(BoundsSpec):
+    __slots__ = ("enemies",)
+
+    def __init__(self, x: float, y: float, width: float, height: float, enemies: int = None):
+        super().__init__(x, y, width, height)
+        # The base number of enemies spawned on this wall, None if enemies (and corpses) can't spawn on it
+        self.enemies: int | None = enemies
+
+    @classmethod
+    def from_dict(cls, data: Any, name: str = "wall") -> WallSpec:
+        _check_keys(data, {"bounds"}, {"enemies"}, name)
+        enemies = data.get("enemies")
+        if enemies is not None and (isinstance(enemies, bool) or not isinstance(enemies, int) or enemies < 0):
+            raise ValueError(f"{name} enemies must be a non-negative integer, got {enemies!r}")
+        return cls(*cls._check_bounds(data, name), enemies)
+
+
+class PlatformSpec(BoundsSpec):
+    __slots__ = ()
+
+    @classmethod
+    def from_dict(cls, data: Any, name: str = "platform") -> PlatformSpec:
+        _check_keys(data, {"bounds"}, set(), name)
+        return cls(*cls._check_bounds(data, name))
+
+
+class GateSpec(BoundsSpec):
+    __slots__ = ("optional",)
+
+    def __init__(self, x: float, y: float, width: float, height: float, optional: bool = False):
+        super().__init__(x, y, width, height)
+        # Optional gates only have a chance to spawn
+        self.optional: bool = optional
+
+    @classmethod
+    def from_dict(cls, data: Any, name: str = "gate") -> GateSpec:
+        _check_keys(data, {"bounds"}, {"optional"}, name)
+        optional = data.get("optional", False)
+        if not isinstance(optional, bool):
+            raise ValueError(f"{name} optional must be a boolean, got {optional!r}")
+        return cls(*cls._check_bounds(data, name), optional)
+
+
+class LoreSpec(BoundsSpec):
+    __slots__ = ("text",)
+
+    def __init__(self, x: float, y: float, width: float, height: float, text: str):
+        super().__init__(x, y, width, height)
+        self.text: str = text
+
+    @classmethod
+    def from_dict(cls, data: Any, name: str = "lore") -> LoreSpec:
+        _check_keys(data, {"bounds", "text"}, set(), name)
+        if not isinstance(data["text"], str):
+            raise ValueError(f"{name} text must be a string, got {data['text']!r}")
+        return cls(*cls._check_bounds(data, name), data["text"])
+
+
+class Segment:
+    """The objects and (for the start segment) spawn data of a map segment."""
+
+    __slots__ = "walls", "platforms", "gates", "lore", "spawn", "init_dir", "init_weapon_pos"
+
+    def __init__(
+        self,
+        walls: list[WallSpec] = None,
+        platforms: list[PlatformSpec] = None,
+        gates: list[GateSpec] = None,
+        lore: list[LoreSpec] = None,
+        spawn: Vec2 = None,
+        init_dir: int = None,
+        init_weapon_pos: Vec2 = None,
+    ):
+        self.walls: list[WallSpec] = walls or []
+        self.platforms: list[PlatformSpec] = platforms or []
+        self.gates: list[GateSpec] = gates or []
+        self.lore: list[LoreSpec] = lore or []
+        self.spawn: Vec2 | None = spawn
+        self.init_dir: int | None = init_dir
+        self.init_weapon_pos: Vec2 | None = init_weapon_pos
+
+    @classmethod
+    def from_dict(cls, data: Any, name: str = "segment") -> Segment:
+        """Creates a segment from parsed segment JSON.
+
+        Parameters
+        ----------
+        data : any
+            The parsed JSON.
+        name : str, default = "segment"
+            The name of the segment, used in error messages.
+
+        Returns
+        -------
+        Segment
+            The validated segment.
+
+        Raises
+        ------
+        ValueError
+            If the data is not a valid segment.
+        """
+
+        _check_keys(data, set(), {*cls.__slots__}, name)
+
+        def specs(prop: str, spec: type[BoundsSpec]) -> list:
+            objs = data.get(prop, [])
+            if not isinstance(objs, list):
+                raise ValueError(f"{name} {prop} must be a list, got {objs!r}")
+            return [spec.from_dict(obj, f"{name} {prop}[{i}]") for i, obj in enumerate(objs)]
+
+        init_dir = data.get("init_dir")
+        if init_dir is not None and init_dir not in (-1, 1):
+            raise ValueError(f"{name} init_dir must be -1 or 1, got {init_dir!r}")
+
+        return cls(
+            specs("walls", WallSpec),
+            specs("platforms", PlatformSpec),
+            specs("gates", GateSpec),
+            specs("lore", LoreSpec),
+            _check_point(data["spawn"], f"{name} spawn") if "spawn" in data else None,
+            init_dir,
+            _check_point(data["init_weapon_pos"], f"{name} init_weapon_pos") if "init_weapon_pos" in data else None,
+        )
+
+    def objects(self) -> list[BoundsSpec]:
+        return self.walls + self.platforms + self.gates + self.lore
+
+    def flip(self, width: float) -> None:
+        """Mirrors all objects in this segment horizontally.
+
+        Parameters
+        ----------
+        width : float
+            The width of the segment.
+        """
+
+        for obj in self.objects():
+            obj.flip(width)
+
+    def extend(self, other: Segment, x_off: float) -> None:
+        """Appends the objects of another segment to this one.
+
+        Parameters
+        ----------
+        other : Segment
+            The segment to append. Its objects are moved and become part of this segment.
+        x_off : float
+            The x offset of the other segment in this one.
+        """
+
+        for obj in other.objects():
+            obj.x += x_off
+
+        self.walls += other.walls
+        self.platforms += other.platforms
+        self.gates += other.gates
+        self.lore += other.lore
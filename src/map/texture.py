@@ -0,0 +1,179 @@
+from enum import Enum
+
+import pygame
+from util.type import Blit
+
+
+class TileKind(Enum):
+    EMPTY = 0  # Fully transparent
+    OPAQUE = 1  # Fully opaque
+    MIXED = 2  # Partially translucent
+
+
+class SplitTexture:
+    """A level texture split into tiles by their transparency, so drawing it only blends where it has to.
+
+    Tiles are classified once when created. Consecutive tiles of the same kind in a row are merged into runs. Empty runs
+    are dropped, opaque runs are copied to surfaces without alpha so they are plain copies when blitted, and mixed runs
+    are copied with alpha and blended. The original texture is not needed afterwards.
+    """
+
+    TILE_SIZE: int = 64
+    # The number of render scales to keep scaled runs for
+    KEPT_SCALES: int = 2
+
+    @staticmethod
+    def classify(texture: pygame.Surface, tile_size: int = TILE_SIZE) -> list[list[TileKind]]:
+        """Classifies the tiles of the given texture by their transparency.
+
+        Parameters
+        ----------
+        texture : pygame.Surface
+            The texture to classify.
+        tile_size : int, default = TILE_SIZE
+            The size of the tiles.
+
+        Returns
+        -------
+        list of list of TileKind
+            The kind of each tile, by row then column.
+        """
+
+        # Pixels which are not fully transparent and pixels which are fully opaque
+        visible = pygame.mask.from_surface(texture, 0)
+        opaque = pygame.mask.from_surface(texture, 254)
+        tile = pygame.Mask((tile_size, tile_size), fill=True)
+
+        kinds = []
+        for y in range(0, texture.height, tile_size):
+            row = []
+            for x in range(0, texture.width, tile_size):
+                if not visible.overlap_area(tile, (x, y)):
+                    row.append(TileKind.EMPTY)
+                elif opaque.overlap_area(tile, (x, y)) == min(tile_size, texture.width - x) * min(
+                    tile_size, texture.height - y
+                ):
+                    row.append(TileKind.OPAQUE)
+                else:
+                    row.append(TileKind.MIXED)
+            kinds.append(row)
+        return kinds
+
+    def __init__(self, texture: pygame.Surface, tile_size: int = TILE_SIZE):
+        self.width: int = texture.width
+        self.height: int = texture.height
+        self.tile_size: int = tile_size
+        # The runs of each tile row as (x, surface), sorted by x
+        self.rows: list[list[tuple[int, pygame.Surface]]] = []
+
+        kinds = SplitTexture.classify(texture, tile_size)
+        counts = dict.fromkeys(TileKind, 0)
+        for row_idx, row_kinds in enumerate(kinds):
+            y = row_idx * tile_size
+            height = min(tile_size, texture.height - y)
+            runs = []
+
+            start = 0
+            for col, kind in enumerate(row_kinds):
+                counts[kind] += 1
+                # End of run
+                if col + 1 == len(row_kinds) or row_kinds[col + 1] is not kind:
+                    x = start * tile_size
+                    area = (x, y, min((col + 1) * tile_size, texture.width) - x, height)
+                    if kind is TileKind.OPAQUE:
+                        runs.append((x, texture.subsurface(area).convert()))
+                    elif kind is TileKind.MIXED:
+                        runs.append((x, texture.subsurface(area).copy()))
+                    start = col + 1
+
+            self.rows.append(runs)
+
+        self.counts: dict[TileKind, int] = counts
+        # Copies of the runs scaled to the last couple of render scales, by scale then by run. Runs are only scaled
+        # once they are first drawn at a scale
+        self.scaled_runs: dict[float, dict[pygame.Surface, pygame.Surface]] = {}
+
+    def get_scaled_run(self, run: pygame.Surface, x: int, y: int, scale: float) -> pygame.Surface:
+        """Gets a copy of the given run scaled to the given render scale, scaling it if it hasn't been yet.
+
+        The run is scaled to fit between its scaled edges rounded to whole pixels, so neighbouring runs still tile
+        without gaps or overlaps.
+
+        Parameters
+        ----------
+        run : pygame.Surface
+            The run to scale.
+        x : int
+            The left of the run.
+        y : int
+            The top of the run.
+        scale : float
+            The render scale.
+
+        Returns
+        -------
+        pygame.Surface
+            The scaled run, to draw at the left and top of the run times the scale, rounded.
+        """
+
+        runs = self.scaled_runs.get(scale)
+        if runs is None:
+            if len(self.scaled_runs) >= SplitTexture.KEPT_SCALES:
+                del self.scaled_runs[next(iter(self.scaled_runs))]  # Oldest scale
+            runs = self.scaled_runs[scale] = {}
+
+        scaled = runs.get(run)
+        if scaled is None:
+            left = round(x * scale)
+            top = round(y * scale)
+            size = max(1, round((x + run.width) * scale) - left), max(1, round((y + run.height) * scale) - top)
+            scaled = runs[run] = pygame.transform.scale(run, size)
+        return scaled
+
+    def get_blits(self, x: float, y: float, width: float, height: float, scale: float = 1) -> list[Blit]:
+        """Gets the blits to draw the given area of this texture at the top left of a surface.
+
+        Parameters
+        ----------
+        x : float
+            The left of the area.
+        y : float
+            The top of the area.
+        width : float
+            The width of the area.
+        height : float
+            The height of the area.
+        scale : float, default = 1
+            The number of surface pixels per texture pixel. Runs are scaled once per scale, see get_scaled_run().
+
+        Returns
+        -------
+        list of Blit
+            The runs intersecting the area and their positions. Runs are clipped by the surface they are drawn to.
+        """
+
+        blits = []
+        right = x + width
+        first_row = max(0, int(y // self.tile_size))
+        last_row = min(len(self.rows), int((y + height) // self.tile_size) + 1)
+        for row_idx in range(first_row, last_row):
+            row_top = row_idx * self.tile_size
+            if scale == 1:
+                row_y = row_top - y
+                for run_x, surface in self.rows[row_idx]:
+                    if run_x >= right:
+                        break
+                    if run_x + surface.width > x:
+                        blits.append((surface, (run_x - x, row_y)))
+            else:
+                row_y = round(row_top * scale) - y * scale
+                for run_x, surface in self.rows[row_idx]:
+                    if run_x >= right:
+                        break
+                    if run_x + surface.width > x:
+                        scaled = self.get_scaled_run(surface, run_x, row_top, scale)
+                        blits.append((scaled, (round(run_x * scale) - x * scale, row_y)))
+        return blits
+
+    def draw(self, surface: pygame.Surface, x: float, y: float, width: float, height: float, scale: float = 1) -> None:
+        surface.fblits(self.get_blits(x, y, width, height, scale))
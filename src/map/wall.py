@@ -1,7 +1,10 @@
 from box import Hitbox
+from util.type import Layer
 
 
 class Wall(Hitbox):
+    LAYER: Layer = Layer.WALL
+
     FRICTION: float = 0.1
 
     def draw(self, *args, **kwargs) -> None:
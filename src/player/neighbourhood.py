@@ -0,0 +1,141 @@
+from collections.abc import Callable, Iterator
+
+import state
+from box import Box
+from util.type import Rect
+
+
+class Neighbourhood:
+    """A snapshot of the map clients around a box, taken once so repeated nearby queries skip the map's grid.
+
+    Queries inside the snapshot's bounds are answered by filtering the snapshot. Queries reaching outside it, or made
+    when there is no snapshot, fall back to the map. The snapshot holds the clients themselves, so it stays correct as
+    long as no client enters or leaves its bounds, i.e. only for the duration of the owner's tick.
+    """
+
+    def __init__(self):
+        self.bounds: Rect | None = None
+        self.clients: list[Box] = []
+        # Queries answered from the snapshot and queries which had to fall back to the map
+        self.hits: int = 0
+        self.misses: int = 0
+
+    def snapshot(self, x: float, y: float, width: float, height: float) -> None:
+        """Takes a snapshot of the map clients in the given rectangle.
+
+        Parameters
+        ----------
+        x : float
+            The left-most x coordinate of the rectangle.
+        y : float
+            The top-most y coordinate of the rectangle.
+        width : float
+            The width of the rectangle.
+        height : float
+            The height of the rectangle.
+        """
+
+        self.bounds = x, y, width, height
+        self.clients = state.current_map.get_rect(x, y, width, height)
+
+    def clear(self) -> None:
+        self.bounds = None
+        self.clients = []
+
+    def get_rect(
+        self, x: float, y: float, width: float, height: float, filter_fn: Callable[[Box], bool] = None
+    ) -> list[Box]:
+        """Fetches all clients within the given rectangle, like :meth:`map.Map.get_rect`.
+
+        Parameters
+        ----------
+        x : float
+            The left-most x coordinate of the rectangle to search in.
+        y : float
+            The top-most y coordinate of the rectangle to search in.
+        width : float
+            The width of the rectangle to search in.
+        height : float
+            The height of the rectangle to search in.
+        filter_fn : callable with parameters [Box] and return bool, optional
+            A function to filter for specific clients.
+
+        Returns
+        -------
+        list of Box
+            The clients within the given rectangle.
+        """
+
+        if self._contains(x, y, width, height):
+            self.hits += 1
+            return list(self._iter_clients(x, y, width, height, filter_fn))
+
+        self.misses += 1
+        return state.current_map.get_rect(x, y, width, height, filter_fn)
+
+    def iter_rect(
+        self, x: float, y: float, width: float, height: float, filter_fn: Callable[[Box], bool] = None
+    ) -> Iterator[Box]:
+        """Lazily yields the clients within the given rectangle, like :meth:`map.Map.iter_rect`.
+
+        Parameters
+        ----------
+        x : float
+            The left-most x coordinate of the rectangle to search in.
+        y : float
+            The top-most y coordinate of the rectangle to search in.
+        width : float
+            The width of the rectangle to search in.
+        height : float
+            The height of the rectangle to search in.
+        filter_fn : callable with parameters [Box] and return bool, optional
+            A function to filter for specific clients.
+
+        Returns
+        -------
+        iterator of Box
+            The clients within the given rectangle.
+        """
+
+        if self._contains(x, y, width, height):
+            self.hits += 1
+            return self._iter_clients(x, y, width, height, filter_fn)
+
+        self.misses += 1
+        return state.current_map.iter_rect(x, y, width, height, filter_fn)
+
+    def any_in_rect(
+        self, x: float, y: float, width: float, height: float, filter_fn: Callable[[Box], bool] = None
+    ) -> bool:
+        """Checks if there are any clients within the given rectangle, stopping at the first.
+
+        See Also
+        --------
+        iter_rect()
+        """
+
+        return next(self.iter_rect(x, y, width, height, filter_fn), None) is not None
+
+    def _contains(self, x: float, y: float, width: float, height: float) -> bool:
+        if self.bounds is None:
+            return False
+        b_x, b_y, b_width, b_height = self.bounds
+        return b_x <= x and b_y <= y and x + width <= b_x + b_width and y + height <= b_y + b_height
+
+    def _iter_clients(
+        self, x: float, y: float, width: float, height: float, filter_fn: Callable[[Box], bool] | None
+    ) -> Iterator[Box]:
+        right = x + width
+        bottom = y + height
+        for c in self.clients:
+            if (
+                x < c.x + c.width
+                and right > c.x
+                and y < c.y + c.height
+                and bottom > c.y
+                and (filter_fn is None or filter_fn(c))
+            ):
+                yield c
+
+    def __str__(self) -> str:
+        return f"{self.__class__.__name__} {{{self.hits=}, {self.misses=}, clients={len(self.clients)}}}"
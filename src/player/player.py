@@ -21,7 +21,9 @@ from util.event import (
 )
 from util.func import clamp, get_project_root
 from util.type import (
+    Blit,
     Collision,
+    Colour,
     Direction,
     Interactable,
     PlayerControl,
@@ -33,7 +35,8 @@ from util.type import (
     Vec2,
 )
 
-from .sprite import EffectSprite, PlayerSprite
+from .neighbourhood import Neighbourhood
+from .sprite import EffectPool, EffectSprite, PlayerSprite
 
 logger = logging.getLogger(__name__)
 
@@ -43,6 +46,8 @@ def _roll_height_fn(x):
 
 
 class Player(Hitbox):
+    DEBUG_COLOUR: Colour = (0, 255, 0)
+
     # The amount of vx the controls add per second (px/s/s)
     CONTROL_ACCEL: int = 1000
     # The decay/s of the speed added by controlling the player
@@ -108,6 +113,9 @@ class Player(Hitbox):
     ε: float = 0.1
     REPULSION_CAP: int = 200
 
+    # How far around the player to snapshot the map each tick, on top of the player's movement
+    NEIGHBOURHOOD_PADDING: int = HEIGHT * 2
+
     @property
     def health(self) -> int:
         return self._health
@@ -263,15 +271,16 @@ class Player(Hitbox):
         self.health_potions: int = 0
         self._health_mul: float = 1  # Health multiplier
         self.state: PlayerState = PlayerState.IDLE
-        self.slam_dust_sprites: list[EffectSprite] = []
-        self.jump_dust_sprites: list[EffectSprite] = []
         self.damage_tint_init_time: float = 0
         self.damage_tint_time: float = 0
         self.should_not_collide: set[Platform] = set()
+        self.neighbourhood: Neighbourhood = Neighbourhood()  # Answers map queries during a tick
 
         # Permanent attributes
         self.sprite: PlayerSprite = PlayerSprite("player/pink")
         self.slam_fall_sprite: EffectSprite = EffectSprite("Slam")
+        self.slam_dust_sprites: EffectPool = EffectPool("Slash_Cloud")
+        self.jump_dust_sprites: EffectPool = EffectPool("Jump_Dust")
         sfx_folder = get_project_root() / "assets/sfx/player"
         self.walk_sfx: Sound = Sound(sfx_folder / "Walk.wav")
         self.sprint_sfx: Sound = Sound(sfx_folder / "Sprint.wav")
@@ -306,6 +315,10 @@ class Player(Hitbox):
         self.jump_dust_sprites.clear()
         self.should_not_collide.clear()
 
+        logger.debug(f"Neighbourhood queries since last reset: {self.neighbourhood}")
+        self.neighbourhood.clear()
+        self.neighbourhood.hits = self.neighbourhood.misses = 0
+
     def handle_moves(self, dt: float, *move_types: PlayerControl) -> None:
         """Handles movement commands.
 
@@ -423,6 +436,28 @@ class Player(Hitbox):
         self._interrupt_attack()
         self.roll_time = Player.ROLL_LENGTH
 
+    def _wall_above(self, top: float) -> bool:
+        """Checks if the given top of the player would be inside a wall, when growing back to base height.
+
+        Parameters
+        ----------
+        top : float
+            The top of the player to check, at most base height above the bottom of the player.
+
+        Returns
+        -------
+        bool
+            Whether there is a wall over the player which the top would be inside.
+        """
+
+        return self.neighbourhood.any_in_rect(
+            self.x,
+            self.y + self.height - Player.HEIGHT,
+            self.width,
+            Player.HEIGHT,
+            lambda e: isinstance(e, Wall) and e.top < top < e.bottom,
+        )
+
     def _stop_rolling(self) -> bool:
         """Stops the player from rolling if the player is able to stop rolling.
 
@@ -432,17 +467,9 @@ class Player(Hitbox):
             Whether the player stopped rolling or not.
         """
 
-        walls_above = state.current_map.get_rect(
-            self.x, self.y + self.height - Player.HEIGHT, self.width, Player.HEIGHT, lambda e: isinstance(e, Wall)
-        )
-        for wall in walls_above:
-            if (
-                wall.top < self.top + self.height - Player.HEIGHT < wall.bottom
-                and wall.left < self.right
-                and wall.right > self.left
-            ):
-                # Top when at base height inside wall and x inside wall
-                return False
+        # Top when at base height inside wall
+        if self._wall_above(self.top + self.height - Player.HEIGHT):
+            return False
 
         self.roll_time = -1
         self.roll_cooldown = Player.ROLL_COOLDOWN
@@ -476,8 +503,17 @@ class Player(Hitbox):
             A list of collisions with the player which happened due to this movement.
         """
 
+        dx = self.vx * dt
+        dy = self.vy * dt
+        walls = self.neighbourhood.get_rect(
+            min(self.x, self.x + dx),
+            min(self.y, self.y + dy),
+            self.width + abs(dx),
+            self.height + abs(dy),
+            lambda e: isinstance(e, Wall),
+        )
         # TODO Damage and move to good pos on exit map bottom
-        return self.move(self.vx * dt, self.vy * dt)
+        return self.move(dx, dy, walls)
 
     def handle_collisions(self, collisions: list[Collision]) -> None:
         """Handles player actions on collisions.
@@ -520,9 +556,9 @@ class Player(Hitbox):
         """
 
         if self.slamming:
-            self.slam_dust_sprites.append(EffectSprite("Slash_Cloud", self.center_x, self.bottom))
+            self.slam_dust_sprites.spawn(self.center_x, self.bottom)
         elif self.jumps <= 0:
-            self.jump_dust_sprites.append(EffectSprite("Jump_Dust", self.center_x, self.bottom))
+            self.jump_dust_sprites.spawn(self.center_x, self.bottom)
             self.land_sfx.play()
 
         self.on_platform = wall
@@ -535,16 +571,13 @@ class Player(Hitbox):
         can_climb_ledge = self.top - wall.top < Player.HEIGHT * Player.LEDGE_CLIMB_HEIGHT
 
         if can_climb_ledge:
-            can_climb_ledge = not [
-                r
-                for r in state.current_map.get_rect(
-                    self.left - (1 if side is Side.LEFT else 0),
-                    wall.top - Player.HEIGHT,
-                    self.width + 1,
-                    self.top - (wall.top - Player.HEIGHT),
-                )
-                if r is not wall
-            ]
+            can_climb_ledge = not self.neighbourhood.any_in_rect(
+                self.left - (1 if side is Side.LEFT else 0),
+                wall.top - Player.HEIGHT,
+                self.width + 1,
+                self.top - (wall.top - Player.HEIGHT),
+                lambda r: r is not wall,
+            )
 
         left_key_down = key_handler.get_control(PlayerControl.LEFT)
         right_key_down = key_handler.get_control(PlayerControl.RIGHT)
@@ -668,9 +701,6 @@ class Player(Hitbox):
             The time between this tick and the last.
         """
 
-        walls_above = state.current_map.get_rect(
-            self.x, self.y + self.height - Player.HEIGHT, self.width, Player.HEIGHT, lambda e: isinstance(e, Wall)
-        )
         if self.rolling:
             roll_height = clamp(
                 int(Player.HEIGHT * _roll_height_fn(self.roll_time / Player.ROLL_LENGTH)),
@@ -678,16 +708,8 @@ class Player(Hitbox):
                 Player.MIN_HEIGHT,
             )
 
-            do_change = True
-            if roll_height > self.height:
-                for wall in walls_above:
-                    if (
-                        wall.top < self.top + self.height - Player.HEIGHT < wall.bottom
-                        and wall.left < self.right
-                        and wall.right > self.left
-                    ):
-                        # Top when at base height inside wall and x inside wall
-                        do_change = False
+            # Top when at base height inside wall
+            do_change = roll_height <= self.height or not self._wall_above(self.top + self.height - Player.HEIGHT)
 
             if do_change:
                 self.top += self.height - roll_height
@@ -708,12 +730,8 @@ class Player(Hitbox):
                 new_top = self.top - diff
                 new_height = self.height + diff
 
-            do_change = True
-            if new_height > self.height:
-                for wall in walls_above:
-                    if wall.top < new_top < wall.bottom and wall.left < self.right and wall.right > self.left:
-                        # New top inside wall and x inside wall
-                        do_change = False
+            # New top inside wall
+            do_change = new_height <= self.height or not self._wall_above(new_top)
 
             if do_change:
                 self.top = new_top
@@ -739,7 +757,7 @@ class Player(Hitbox):
         # AAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAA CIRCULAR IMPORTSSSS
         from enemy.enemy import Enemy
 
-        for enemy in state.current_map.get_rect(
+        for enemy in self.neighbourhood.get_rect(
             self.left - Player.SLAM_RANGE[0],
             self.top - Player.SLAM_RANGE[1],
             self.width + Player.SLAM_RANGE[0] * 2,
@@ -758,7 +776,7 @@ class Player(Hitbox):
     def tick_collision(self, dt: float) -> None:
         from enemy.enemy import Enemy
 
-        for enemy in state.current_map.get_rect(*self, lambda e: isinstance(e, Enemy) and not e.dead):
+        for enemy in self.neighbourhood.get_rect(*self, lambda e: isinstance(e, Enemy) and not e.dead):
             # Get as ratio, 1 is touching edges, 0 is exact same spot
             dx = (enemy.center_x - self.center_x) / ((self.width + enemy.width) / 2)
             dy = (enemy.center_y - self.center_y) / ((self.height + enemy.height) / 2)
@@ -772,17 +790,8 @@ class Player(Hitbox):
 
     def tick_sprites(self, dt: float) -> None:
         self.sprite.tick(dt)
-
-        to_remove = []
-        for sprite in self.slam_dust_sprites + self.jump_dust_sprites:
-            end = sprite.tick(dt)
-            if end:
-                to_remove.append(sprite)
-        for sprite in to_remove:
-            if sprite in self.slam_dust_sprites:
-                self.slam_dust_sprites.remove(sprite)
-            if sprite in self.jump_dust_sprites:
-                self.jump_dust_sprites.remove(sprite)
+        self.slam_dust_sprites.tick(dt)
+        self.jump_dust_sprites.tick(dt)
 
     def tick_state(self, dt: float) -> None:
         if self.weapon and self.weapon.attacking:
@@ -851,8 +860,29 @@ class Player(Hitbox):
         ):
             self.climb_sfx.fadeout(350)
 
+    def take_neighbourhood(self, dt: float) -> None:
+        """Snapshots the map around the player, so the rest of this tick's queries don't each search the map.
+
+        Parameters
+        ----------
+        dt : float
+            The time between this tick and the last tick in seconds.
+        """
+
+        dx = self.vx * dt
+        dy = self.vy * dt
+        padding = Player.NEIGHBOURHOOD_PADDING
+        self.neighbourhood.snapshot(
+            min(self.x, self.x + dx) - padding,
+            min(self.y, self.y + dy) - padding,
+            self.width + abs(dx) + padding * 2,
+            self.height + abs(dy) + padding * 2,
+        )
+
     def tick(self, dt: float, moves: list[PlayerControl]) -> None:
         self.handle_moves(dt, *moves)
+        # After handling moves as interacting can add to the map
+        self.take_neighbourhood(dt)
         self.tick_changes(dt)
         if self.weapon is not None:
             damage = self.weapon.tick(dt)
@@ -865,7 +895,8 @@ class Player(Hitbox):
         self.handle_collisions(collisions)
 
         # Remove any platforms not currently colliding with
-        self.should_not_collide &= set(state.current_map.get_rect(*self, lambda e: isinstance(e, Platform)))
+        self.should_not_collide &= set(self.neighbourhood.get_rect(*self, lambda e: isinstance(e, Platform)))
+        self.neighbourhood.clear()  # Not valid outside of this tick
 
         self.tick_sprites(dt)
         self.tick_state(dt)
@@ -898,20 +929,19 @@ class Player(Hitbox):
         pygame.event.post(pygame.Event(PLAYER_WEAPON_CHANGED, new_value=weapon))
         logger.debug(f"Weapon changed: {repr(weapon)}")
 
-    def draw(self, surface: pygame.Surface, x_off: float = 0, y_off: float = 0):
-        # super().draw(surface, (0, 255, 0), x_off, y_off)
-
+    def get_blits(self, x_off: float = 0, y_off: float = 0) -> list[Blit]:
+        blits = []
         for dust_sprite in self.slam_dust_sprites:
             x = dust_sprite.x + x_off
             y = dust_sprite.y + y_off
             sprite = dust_sprite.get_current_sprite(Side.LEFT)
-            surface.blit(sprite, (x - sprite.width, y - sprite.height))
+            blits.append((sprite, (x - sprite.width, y - sprite.height)))
             sprite = dust_sprite.get_current_sprite(Side.RIGHT)
-            surface.blit(sprite, (x, y - sprite.height))
+            blits.append((sprite, (x, y - sprite.height)))
 
         for dust_sprite in self.jump_dust_sprites:
             sprite = dust_sprite.get_current_sprite(Side.RIGHT)  # Doesn't matter which side
-            surface.blit(sprite, (dust_sprite.x + x_off - sprite.width / 2, dust_sprite.y + y_off - sprite.height))
+            blits.append((sprite, (dust_sprite.x + x_off - sprite.width / 2, dust_sprite.y + y_off - sprite.height)))
 
         c_x_w_off = self.center_x + x_off
         b_y_w_off = self.bottom + y_off
@@ -919,12 +949,22 @@ class Player(Hitbox):
         # Slam effect behind player sprite
         if self.slamming:
             sprite = self.slam_fall_sprite.get_current_sprite(Side.LEFT)
-            surface.blit(sprite, (c_x_w_off - sprite.width, b_y_w_off - sprite.height * 0.8))
+            blits.append((sprite, (c_x_w_off - sprite.width, b_y_w_off - sprite.height * 0.8)))
             sprite = self.slam_fall_sprite.get_current_sprite(Side.RIGHT)
-            surface.blit(sprite, (c_x_w_off, b_y_w_off - sprite.height * 0.8))
+            blits.append((sprite, (c_x_w_off, b_y_w_off - sprite.height * 0.8)))
 
         sprite = self.sprite.current_sprite
-        surface.blit(sprite, (c_x_w_off - sprite.width / 2, b_y_w_off - sprite.height))
+        blits.append((sprite, (c_x_w_off - sprite.width / 2, b_y_w_off - sprite.height)))
+
+        if self.weapon is not None:
+            blits += self.weapon.get_blits(x_off, y_off)
+
+        return blits
+
+    def draw(self, surface: pygame.Surface, x_off: float = 0, y_off: float = 0):
+        surface.fblits(self.get_blits(x_off, y_off))
 
+    def draw_debug(self, surface: pygame.Surface, x_off: float = 0, y_off: float = 0) -> None:
+        super().draw_debug(surface, x_off, y_off)
         if self.weapon is not None:
-            self.weapon.draw(surface, (94, 101, 219), x_off, y_off)
+            self.weapon.draw_debug(surface, x_off, y_off)
@@ -1,3 +1,4 @@
+from functools import cache
 from pathlib import Path
 
 import pygame
@@ -28,6 +29,12 @@ def _get_sprites_from_sheet(sheet: Path) -> SpriteList:
     return sprites_left, sprites_right
 
 
+@cache
+def _get_effect_sprites(effect: str) -> SpriteList:
+    """Loads the frames of the given effect once, so every sprite of the same effect shares them."""
+    return _get_sprites_from_sheet(get_project_root() / "assets/vfx" / f"{effect}.png")
+
+
 class State:
     @property
     def frame(self) -> int:
@@ -115,7 +122,7 @@ class PlayerSprite:
 
 class EffectSprite(State):
     def __init__(self, effect: str, x: float = None, y: float = None, once: bool = False, speed: float = 1):
-        super().__init__(_get_sprites_from_sheet(get_project_root() / "assets/vfx" / f"{effect}.png"), speed)
+        super().__init__(_get_effect_sprites(effect), speed)
         # Position for static
         self.x: float = x
         self.y: float = y
@@ -131,3 +138,62 @@ class EffectSprite(State):
         if end:
             self.has_run = True
         return end
+
+    def reset(self, x: float = None, y: float = None) -> None:
+        """Restarts this effect at the given position so it can be reused."""
+
+        self.x = x
+        self.y = y
+        self.time = 0
+        self.has_run = False
+
+
+class EffectPool:
+    """A pool of reusable effect sprites of the same effect.
+
+    Sprites are reset and reused once their animation ends, so spawning an effect does not allocate or load anything.
+    """
+
+    def __init__(self, effect: str, size: int = 4, **kwargs):
+        self.effect: str = effect
+        self.kwargs: dict = kwargs
+        self.active: list[EffectSprite] = []
+        self.free: list[EffectSprite] = [EffectSprite(effect, **kwargs) for _ in range(size)]
+
+    def spawn(self, x: float, y: float) -> EffectSprite:
+        """Starts an effect at the given position.
+
+        Parameters
+        ----------
+        x : float
+            The x position of the effect.
+        y : float
+            The y position of the effect.
+
+        Returns
+        -------
+        EffectSprite
+            The started effect.
+        """
+
+        sprite = self.free.pop() if self.free else EffectSprite(self.effect, **self.kwargs)
+        sprite.reset(x, y)
+        self.active.append(sprite)
+        return sprite
+
+    def tick(self, dt: float) -> None:
+        """Ticks all active effects and returns finished ones to the pool."""
+
+        i = 0
+        while i < len(self.active):
+            if self.active[i].tick(dt):
+                self.free.append(self.active.pop(i))
+            else:
+                i += 1
+
+    def clear(self) -> None:
+        self.free += self.active
+        self.active.clear()
+
+    def __iter__(self):
+        return iter(self.active)
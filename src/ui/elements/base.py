@@ -31,6 +31,10 @@ class UIElement(pygame.FRect):
 
         # If this ui element needs to be updated, true on init cause needs to be updated
         self.dirty: bool = True
+        # If this ui element changed since its redraw rects were last fetched
+        self.redraw: bool = True
+        # The area this ui element covered when its redraw rects were last fetched
+        self.drawn_bounds: pygame.Rect | None = None
 
         # Init update position and anything else
         self.update()
@@ -108,6 +112,39 @@ class UIElement(pygame.FRect):
         if self.dirty:
             self.update_position()
             self.dirty = False
+            self.redraw = True
+
+    @property
+    def bounds(self) -> pygame.Rect:
+        """The area this ui element draws to."""
+        # Converting to a Rect truncates, so pad to cover partial pixels
+        return pygame.Rect(self).inflate(4, 4)
+
+    def get_redraw_rects(self, force: bool = False) -> list[pygame.Rect]:
+        """Gets the areas that need to be redrawn because this ui element changed since the last call.
+
+        This includes both where this element was and where it is now. This should be called once per frame after
+        updating.
+
+        Parameters
+        ----------
+        force : bool, default = False
+            Whether to return the areas even if this element hasn't changed.
+
+        Returns
+        -------
+        list of pygame.Rect
+            The areas to redraw, empty if nothing changed.
+        """
+
+        if not (self.redraw or force):
+            return []
+
+        self.redraw = False
+        bounds = self.bounds
+        rects = [bounds] if self.drawn_bounds is None or self.drawn_bounds == bounds else [self.drawn_bounds, bounds]
+        self.drawn_bounds = bounds
+        return rects
 
     def handle_event(self, event: pygame.Event) -> None:
         """Handles the given event. This should be called per event.
@@ -194,6 +231,12 @@ class Panel(UIElement):
         for child in self.children:
             child.update()
 
+    def get_redraw_rects(self, force: bool = False) -> list[pygame.Rect]:
+        # Panels don't draw anything themselves, but moving a panel moves all its children
+        force = force or self.redraw
+        self.redraw = False
+        return [rect for child in self.children for rect in child.get_redraw_rects(force)]
+
     def draw(self, surface: pygame.Surface) -> None:
         for child in self.children:
             child.draw(surface)
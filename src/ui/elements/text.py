@@ -173,6 +173,11 @@ class ShadowText(Text):
 
         super().update()
 
+    @property
+    def bounds(self) -> pygame.Rect:
+        bounds = super().bounds
+        return bounds.union(bounds.move(self.shadow_off, self.shadow_off))
+
     def draw(self, surface: pygame.Surface) -> None:
         surface.blit(self.shadow, (self.x + self.shadow_off, self.y + self.shadow_off))
         super().draw(surface)
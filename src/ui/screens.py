@@ -1,10 +1,12 @@
 from __future__ import annotations
 
+import logging
 import math
 import random
 from threading import Thread
 
 import config
+import debug
 import pygame
 import state
 from camera import Camera
@@ -24,8 +26,8 @@ from util.event import (
     SCORE_CHANGED,
     UI_BUTTON_PRESSED,
 )
-from util.func import change_music, clamp, get_font, get_fps, get_project_root
-from util.type import PlayerControl, Sound
+from util.func import change_music, clamp, fast_blur, get_font, get_fps, get_project_root
+from util.type import Colour, PlayerControl, Sound, Vec2
 
 from .elements import (
     Checkbox,
@@ -43,8 +45,13 @@ from .elements import (
     WeaponDisplay,
 )
 
+logger = logging.getLogger(__name__)
+
 
 class Screen:
+    # The fps cap when nothing changed last frame
+    IDLE_FPS: int = 30
+
     def __init__(self, parent: Screen, window: pygame.Surface, clock: pygame.Clock, fps_cap: int = None):
         self.parent: Screen = parent
         self.window: pygame.Surface = window
@@ -53,6 +60,10 @@ class Screen:
 
         self.exit: bool = False
         self.dt: float = 0
+        # If the whole window needs to be redrawn (for screens which support partial redraws)
+        self.full_redraw: bool = True
+        # If nothing changed last frame
+        self.idle: bool = False
 
     def init_loop(self) -> None:
         self.exit = False
@@ -62,7 +73,7 @@ class Screen:
         self.init_loop()
 
         while True:
-            self.dt = self.clock.tick(self.fps_cap) / 1000  # To get in seconds
+            self.dt = self.clock.tick(Screen.IDLE_FPS if self.idle else self.fps_cap) / 1000  # To get in seconds
 
             self.pre_event_handling()
 
@@ -79,8 +90,12 @@ class Screen:
                 self.on_full_exit()
                 return True
 
-            self.draw()
-            pygame.display.flip()
+            rects = self.draw()
+            if rects is None:
+                pygame.display.flip()
+            elif rects:
+                pygame.display.update(rects)
+            self.idle = rects is not None and not rects
 
     def handle_event(self, event: pygame.Event) -> bool:
         if event.type == pygame.QUIT:
@@ -92,10 +107,13 @@ class Screen:
                 config.muted = not config.muted
         elif event.type == pygame.VIDEORESIZE:
             self.on_resize(*event.size)
+        elif event.type == pygame.WINDOWEXPOSED:
+            self.full_redraw = True
 
     def on_resize(self, width: int, height: int) -> None:
         self.width = width
         self.height = height
+        self.full_redraw = True
 
     def on_exit(self) -> None:
         if self.parent:
@@ -110,8 +128,15 @@ class Screen:
     def update(self) -> bool:
         pass
 
-    def draw(self) -> None:
-        pass
+    def draw(self) -> list[pygame.Rect] | None:
+        """Draws this screen to the window. This should be called once per frame.
+
+        Returns
+        -------
+        list of pygame.Rect or None
+            The areas of the window that changed, or None if the whole window should be updated. An empty list means
+            nothing changed, so the display is not updated and the frame rate is throttled.
+        """
 
 
 class DeathScreen(Screen):
@@ -170,22 +195,89 @@ class DeathScreen(Screen):
 
 
 class Game(Screen):
-    def create_damage_tint(self, width: int, height: int, strength: int, size: int = 5) -> pygame.Surface:
-        strength = 255 - strength
-        surface = pygame.Surface((size, size)).convert()
-        surface.fill((255, 255, 255))
-        pygame.draw.rect(surface, (255, strength, strength), (0, 0, size, size), width=1)
-        return pygame.transform.smoothscale(surface, (width, height))
+    # Dynamic resolution lowers the render scale when the average frame time is above this fraction of the frame budget
+    DYNAMIC_RES_LOWER_AT: float = 0.9
+    # And raises it (up to the configured scale) when below this fraction, the gap stops it flip flopping
+    DYNAMIC_RES_RAISE_AT: float = 0.6
+    DYNAMIC_RES_STEP: float = 0.1
+    # Minimum time in seconds between render scale changes
+    DYNAMIC_RES_COOLDOWN: float = 1
+
+    # The time in seconds the window size has to stay the same before resizing everything to it
+    RESIZE_DEBOUNCE: float = 0.2
+
+    # The fraction of the world's size the damage tint covers from each edge
+    DAMAGE_TINT_SIZE: float = 0.15
 
     def create_damage_tints(self, width: int, height: int, start: int = 1, stop: int = 255, step: int = 25) -> None:
-        self.damage_tints = [self.create_damage_tint(width, height, i) for i in range(start, stop, step)]
-        self.max_damage_tint = len(self.damage_tints) - 1
+        """Creates the damage tint, a red gradient along each edge of the world multiplied over only those edges.
+
+        Each tint level is just a colour. The strips are filled with the colour of the current level and faded to
+        white towards the center with a gradient mask, which only happens when the level changes.
+
+        Parameters
+        ----------
+        width : int
+            The width of the world.
+        height : int
+            The height of the world.
+        start : int, default = 1
+            The strength of the weakest tint level.
+        stop : int, default = 255
+            The strength to stop at (exclusive).
+        step : int, default = 25
+            The strength difference between tint levels.
+        """
+
+        self.damage_tint_colours: list[Colour] = [(255, 255 - i, 255 - i) for i in range(start, stop, step)]
+        self.max_damage_tint = len(self.damage_tint_colours) - 1
+        self.damage_tint_level: int | None = None
+
+        thickness_x = max(1, int(width * Game.DAMAGE_TINT_SIZE))
+        thickness_y = max(1, int(height * Game.DAMAGE_TINT_SIZE))
+
+        # White, transparent at the edge to opaque towards the center
+        gradient = pygame.Surface((1, 16), pygame.SRCALPHA)
+        for y in range(gradient.height):
+            gradient.set_at((0, y), (255, 255, 255, 255 * y // (gradient.height - 1)))
+        top = pygame.transform.smoothscale(gradient, (width, thickness_y))
+        left = pygame.transform.smoothscale(
+            pygame.transform.rotate(gradient, 90), (thickness_x, height - thickness_y * 2)
+        )
+        self.damage_tint_masks: list[pygame.Surface] = [
+            top,
+            pygame.transform.flip(top, False, True),
+            left,
+            pygame.transform.flip(left, True, False),
+        ]
+        self.damage_tint_strips: list[pygame.Surface] = [
+            pygame.Surface(mask.size).convert() for mask in self.damage_tint_masks
+        ]
+        self.damage_tint_pos: list[Vec2] = [
+            (0, 0),
+            (0, height - thickness_y),
+            (0, thickness_y),
+            (width - thickness_x, thickness_y),
+        ]
 
     def __init__(self, parent: Screen, window: pygame.Surface, clock: pygame.Clock, fps_cap: int = None):
         super().__init__(parent, window, clock, fps_cap)
 
         self.enter_map_sfx: Sound = Sound(get_project_root() / "assets/sfx/Enter_Level.wav")
 
+        # Surface the world is rendered to, the window itself when rendering at full scale
+        self.world: pygame.Surface = window
+        self.render_scale: float = config.render_scale
+        # Moving average of the time spent per frame (excluding waiting for the fps cap) for dynamic resolution
+        self.frame_time: float = 0
+        self.render_scale_cooldown: float = 0
+
+        # Time left until a pending resize is applied, None if there is none
+        self.resize_time: float | None = None
+
+        # Darkened and blurred frame behind the pause and back screens, None when the frame changed
+        self.pause_background: pygame.Surface | None = None
+
         # Dummy rect for scaling
         self.dummy_rect: pygame.FRect = pygame.FRect(0, 0, 1920, 1080)
 
@@ -391,24 +483,80 @@ class Game(Screen):
         self.paused = False
         self.back_confirm = False
         self.need_update = False
+        self.pause_background = None
+
+        self.render_scale = config.render_scale
+        self.frame_time = 0
+        self.render_scale_cooldown = Game.DYNAMIC_RES_COOLDOWN
 
         super().init_loop()
+        self.apply_resize()  # Don't wait for the initial size
 
     def on_resize(self, width: int, height: int) -> None:
         super().on_resize(width, height)
 
-        state.camera.resize(width, height)
-        if not state.current_map.static_bg:
-            state.current_map.background.resize(width, height)
+        # Dragging a window edge fires many resize events, so wait for the size to settle
+        self.resize_time = Game.RESIZE_DEBOUNCE
+
+    def apply_resize(self) -> None:
+        """Resizes the world and UI to the current window size."""
 
-        scale = min(width / self.dummy_rect.width, height / self.dummy_rect.height)
+        self.resize_time = None
+        self.resize_world()
+
+        scale = min(self.width / self.dummy_rect.width, self.height / self.dummy_rect.height)
         self.dummy_rect.scale_by_ip(scale)  # Dummy rect to get scale
         for el in self.ui_elements:
             el.scale_by_ip(scale)
 
+        self.pause_background = None
+        self.need_update = True
+
+    def resize_world(self) -> None:
+        """Resizes the world surface and everything drawn to it to the window size times the render scale.
+
+        The camera's viewport stays the size of the window, so the render scale only changes the resolution of the
+        world, not how much of it is visible.
+        """
+
+        width = max(1, round(self.width * self.render_scale))
+        height = max(1, round(self.height * self.render_scale))
+
+        if self.render_scale == 1:
+            self.world = self.window
+        else:
+            self.world = pygame.Surface((width, height)).convert()
+
+        state.camera.resize(self.width, self.height)
+        if not state.current_map.static_bg:
+            state.current_map.background.resize(width, height)
+
         self.create_damage_tints(width, height)
 
-        self.need_update = True
+    def update_render_scale(self) -> None:
+        """Lowers or raises the render scale based on the average frame time if dynamic resolution is enabled."""
+
+        if not config.dynamic_resolution:
+            return
+
+        budget = 1 / self.fps_cap
+        # Clamp so one off hitches (e.g. loading a new map) don't drag the average up for ages
+        self.frame_time += (min(self.clock.get_rawtime() / 1000, budget * 2) - self.frame_time) * 0.1
+        self.render_scale_cooldown -= self.dt
+        if self.render_scale_cooldown > 0:
+            return
+
+        if self.frame_time > budget * Game.DYNAMIC_RES_LOWER_AT and self.render_scale > config.MIN_RENDER_SCALE:
+            render_scale = max(config.MIN_RENDER_SCALE, self.render_scale - Game.DYNAMIC_RES_STEP)
+        elif self.frame_time < budget * Game.DYNAMIC_RES_RAISE_AT and self.render_scale < config.render_scale:
+            render_scale = min(config.render_scale, self.render_scale + Game.DYNAMIC_RES_STEP)
+        else:
+            return
+
+        logger.debug(f"Dynamic resolution: render scale {self.render_scale} -> {render_scale}")
+        self.render_scale = round(render_scale, 2)
+        self.render_scale_cooldown = Game.DYNAMIC_RES_COOLDOWN
+        self.resize_world()
 
     def load_map(self) -> None:
         try:
@@ -466,6 +614,8 @@ class Game(Screen):
                 self.moves.append(PlayerControl.JUMP)
             elif event.key == pygame.K_f:
                 self.moves.append(PlayerControl.INTERACT)
+            elif event.key == debug.KEY:
+                debug.toggle()
             elif event.key == pygame.K_COMMA:
                 self.moves.append(PlayerControl.ATTACK_START)
             elif event.key == pygame.K_LSHIFT or event.key == pygame.K_RSHIFT:
@@ -506,6 +656,11 @@ class Game(Screen):
     def update(self) -> bool:
         self.fps.text_str = f"FPS: {round(self.clock.get_fps(), 2)}"
 
+        if self.resize_time is not None:
+            self.resize_time -= self.dt
+            if self.resize_time <= 0:
+                self.apply_resize()
+
         for el in self.ui_elements:
             el.update()
 
@@ -531,6 +686,7 @@ class Game(Screen):
                 return full_exit
             state.current_map.tick(self.dt)
             state.camera.tick_move(self.dt)
+            self.update_render_scale()
 
     def draw_damage_tint(self) -> None:
         low_health = 0 <= state.player.health <= state.player.max_health * 0.2
@@ -546,9 +702,16 @@ class Game(Screen):
                     * (self.max_damage_tint / 2),
                 )
 
-            self.window.blit(self.damage_tints[int(intensity)], (0, 0), special_flags=pygame.BLEND_MULT)
+            level = int(intensity)
+            if level != self.damage_tint_level:
+                self.damage_tint_level = level
+                for strip, mask in zip(self.damage_tint_strips, self.damage_tint_masks):
+                    strip.fill(self.damage_tint_colours[level])
+                    strip.blit(mask, (0, 0))
 
-    def draw(self) -> None:
+            self.world.fblits(zip(self.damage_tint_strips, self.damage_tint_pos), pygame.BLEND_MULT)
+
+    def draw(self) -> list[pygame.Rect] | None:
         if not state.map_loaded:
             # Loading screen
             self.window.fill((0, 0, 0))
@@ -556,28 +719,44 @@ class Game(Screen):
                 el.draw(self.window)
             return
 
-        if self.need_update or not (self.paused or self.back_confirm):
+        paused = self.paused or self.back_confirm
+        # The window was uncovered or restored, so a paused frame must be drawn again too
+        redraw = self.need_update or self.full_redraw
+        self.full_redraw = False
+        # Only render the world when paused if there is no frame to reuse (e.g. just resized)
+        if not paused or (redraw and self.pause_background is None):
             # Draw stuff
-            state.camera.render(self.window)
+            state.camera.render(self.world, self.render_scale)
 
             self.draw_damage_tint()
+            if self.world is not self.window:
+                # Upscale world, UI is drawn on top at native resolution
+                pygame.transform.scale(self.world, self.window.size, self.window)
+            if debug.enabled:
+                state.camera.render_debug(self.window)
             for el in self.overlay_elements:
                 el.draw(self.window)
 
-        if self.need_update and (self.back_confirm or self.paused):
-            # Darken and blur
-            self.window.fill((140, 140, 140), special_flags=pygame.BLEND_MULT)
-            surface = pygame.transform.gaussian_blur(self.window, 10)
+            self.pause_background = None
+
+        if redraw and paused:
+            if self.pause_background is None:
+                # Darken and blur
+                self.window.fill((140, 140, 140), special_flags=pygame.BLEND_MULT)
+                self.pause_background = fast_blur(self.window, 10)
+            self.window.blit(self.pause_background, (0, 0))
 
             if self.back_confirm:
                 for el in self.back_elements:
-                    el.draw(surface)
+                    el.draw(self.window)
             else:
                 for el in self.pause_elements:
-                    el.draw(surface)
+                    el.draw(self.window)
 
-            self.window.blit(surface, (0, 0))
             self.need_update = False
+        elif paused:
+            # Static paused frame, nothing to update
+            return []
 
 
 class MenuScreen(Screen):
@@ -629,9 +808,23 @@ class MenuScreen(Screen):
         self.background.update()
         self.panel.update()
 
-    def draw(self) -> None:
-        self.background.draw(self.window)
-        self.panel.draw(self.window)
+    def draw(self) -> list[pygame.Rect] | None:
+        # Always fetch to reset change tracking
+        rects = self.background.get_redraw_rects() + self.panel.get_redraw_rects()
+
+        if self.full_redraw:
+            self.full_redraw = False
+            self.background.draw(self.window)
+            self.panel.draw(self.window)
+            return None
+
+        # Only redraw changed areas
+        for rect in rects:
+            self.window.set_clip(rect)
+            self.background.draw(self.window)
+            self.panel.draw(self.window)
+        self.window.set_clip(None)
+        return rects
 
 
 class HardcoreWarning(MenuScreen):
@@ -685,6 +878,71 @@ class Controls(MenuScreen):
         )
 
 
+class Settings(MenuScreen):
+    # The render scales to cycle through, from the highest
+    RENDER_SCALES: tuple[float, ...] = (1, 0.75, 0.5, 0.25)
+
+    def __init__(self, parent: Screen, window: pygame.Surface, clock: pygame.Clock, fps_cap: int = None):
+        super().__init__(parent, window, clock, fps_cap)
+
+        text_colour = 176, 166, 145
+        option_font = get_font("PixelifySans", 80, "Bold")
+        self.muted_button = Checkbox(
+            (0, -200),
+            option_font,
+            "Muted",
+            text_colour,
+            checked=config.muted,
+            container=self.panel,
+            anchors={"center": "center"},
+        )
+        self.render_scale_button = ShadowTextButton(
+            (0, 40),
+            option_font,
+            self.get_render_scale_text(),
+            text_colour,
+            container=self.panel,
+            anchors={"centerx": "centerx", "top": "bottom", "top_target": self.muted_button},
+        )
+        self.dynamic_resolution_button = Checkbox(
+            (0, 40),
+            option_font,
+            "Dynamic Resolution",
+            text_colour,
+            checked=config.dynamic_resolution,
+            container=self.panel,
+            anchors={"centerx": "centerx", "top": "bottom", "top_target": self.render_scale_button},
+        )
+
+    @staticmethod
+    def get_render_scale_text() -> str:
+        return f"Render Scale: {config.render_scale:.0%}"
+
+    def handle_event(self, event: pygame.Event, only_parent: bool = False) -> bool:
+        if super().handle_event(event):
+            return True
+
+        if event.type == UI_BUTTON_PRESSED:
+            if event.element is self.muted_button:
+                config.muted = self.muted_button.checked
+            elif event.element is self.render_scale_button:
+                # Next lower scale, wrapping around to the highest
+                config.render_scale = next(
+                    (scale for scale in Settings.RENDER_SCALES if scale < config.render_scale),
+                    Settings.RENDER_SCALES[0],
+                )
+            elif event.element is self.dynamic_resolution_button:
+                config.dynamic_resolution = self.dynamic_resolution_button.checked
+
+    def update(self) -> None:
+        # Keep in sync with the config, e.g. when muted with the keyboard shortcut
+        self.muted_button.checked = config.muted
+        self.render_scale_button.text_str = self.get_render_scale_text()
+        self.dynamic_resolution_button.checked = config.dynamic_resolution
+
+        super().update()
+
+
 class MainMenu(MenuScreen):
     def __init__(self, window: pygame.Surface, clock: pygame.Clock, fps_cap: int = None):
         super().__init__(None, window, clock, fps_cap, "Exit")
@@ -715,17 +973,26 @@ class MainMenu(MenuScreen):
             container=self.panel,
             anchors={"centerx": "centerx", "top": "bottom", "top_target": self.start_button},
         )
+        self.settings_button = ShadowTextButton(
+            (0, 30),
+            sub_button_font,
+            "Settings",
+            text_colour,
+            container=self.panel,
+            anchors={"centerx": "centerx", "top": "bottom", "top_target": self.controls_button},
+        )
         self.hardcore_button = Checkbox(
             (0, 30),
             sub_button_font,
             "Hardcore",
             text_colour,
             container=self.panel,
-            anchors={"centerx": "centerx", "top": "bottom", "top_target": self.controls_button},
+            anchors={"centerx": "centerx", "top": "bottom", "top_target": self.settings_button},
         )
 
         self.game_screen = Game(self, window, clock)
         self.controls_screen = Controls(self, window, clock)
+        self.settings_screen = Settings(self, window, clock)
 
     def init_loop(self) -> None:
         super().init_loop()
@@ -748,6 +1015,9 @@ class MainMenu(MenuScreen):
             elif event.element is self.controls_button:
                 self.controls_button.hovered = False
                 full_exit = self.controls_screen.main_loop()
+            elif event.element is self.settings_button:
+                self.settings_button.hovered = False
+                full_exit = self.settings_screen.main_loop()
             elif event.element is self.hardcore_button:
                 state.hardcore = self.hardcore_button.checked
                 if not self.hardcore_warned:
@@ -129,3 +129,28 @@ def normalise_for_drawing(
 def render_interact_text(text: str, colour: Colour = (255, 255, 255), key: bool = True) -> pygame.Surface:
     # Damn it I have to create the font here because if not pygame.font won't be initialized yet
     return get_font("PixelifySans", 18).render(("[F] " if key else "") + text, True, colour)
+
+
+def fast_blur(surface: pygame.Surface, radius: int, downscale: int = 4) -> pygame.Surface:
+    """Approximates a gaussian blur of the given surface by blurring a downscaled copy and scaling it back up.
+
+    Parameters
+    ----------
+    surface : pygame.Surface
+        The surface to blur.
+    radius : int
+        The blur radius at full resolution.
+    downscale : int, default = 4
+        The factor to downscale by before blurring.
+
+    Returns
+    -------
+    pygame.Surface
+        A new blurred surface the same size as the given surface.
+    """
+
+    small = pygame.transform.smoothscale(
+        surface, (max(1, surface.width // downscale), max(1, surface.height // downscale))
+    )
+    small = pygame.transform.gaussian_blur(small, max(1, round(radius / downscale)))
+    return pygame.transform.smoothscale(small, surface.size)
@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 from abc import ABC, abstractmethod
-from enum import Enum
+from enum import Enum, IntFlag, auto
 from typing import TYPE_CHECKING
 
 import pygame
@@ -14,13 +14,34 @@ type Line = tuple[Vec2, Vec2] | list[Vec2]
 type Size = tuple[int, int] | list[int]  # TODO use frects, get rid of int size
 type Rect = tuple[float, float, int, int] | list[float]  # Vec2, Size
 type Colour = tuple[int, int, int] | list[int]
+type Blit = tuple[pygame.Surface, Vec2]  # Source, dest
 
 
 class Drawable(ABC):
+    __slots__ = ()
+
     @abstractmethod
     def draw(self, surface: pygame.Surface, x_off: float, y_off: float, **kwargs) -> None:
         pass
 
+    def get_blits(self, x_off: float, y_off: float) -> list[Blit] | None:
+        """Gets the blits that draw this drawable, so they can be batched with the blits of other drawables.
+
+        Parameters
+        ----------
+        x_off : float
+            The offset in the x direction to draw at.
+        y_off : float
+            The offset in the y direction to draw at.
+
+        Returns
+        -------
+        list of Blit or None
+            The blits in draw order, or None if this drawable can't be drawn with blits and must be drawn via draw().
+        """
+
+        return None
+
 
 class Interactable(ABC):
     @abstractmethod
@@ -28,9 +49,12 @@ class Interactable(ABC):
         pass
 
     @abstractmethod
-    def draw_popup(self, surface: pygame.Surface, x_off: float, y_off: float, **kwargs) -> None:
+    def get_popup_blits(self, x_off: float, y_off: float) -> list[Blit]:
         pass
 
+    def draw_popup(self, surface: pygame.Surface, x_off: float, y_off: float, **kwargs) -> None:
+        surface.fblits(self.get_popup_blits(x_off, y_off))
+
 
 class Side(Enum):
     LEFT = -1
@@ -78,10 +102,30 @@ class EnemyState(Enum):
     ALERTED = "alerted"
 
 
+class Layer(IntFlag):
+    """The kinds of map clients, so map queries can be restricted to the clients they care about."""
+
+    WALL = auto()
+    ENEMY = auto()
+    PICKUP = auto()
+    EFFECT = auto()
+    OTHER = auto()
+    ALL = WALL | ENEMY | PICKUP | EFFECT | OTHER
+
+
 class Collision:
-    def __init__(self, direction: Direction, entity: Hitbox):
+    def __init__(self, direction: Direction, entity: Hitbox, time: float = 0):
         self.direction = direction
         self.entity = entity
+        # The fraction of the movement at which the collision happened
+        self.time = time
+
+    @property
+    def normal(self) -> Vec2:
+        """The normal of the contact surface, pointing away from the entity towards the moving box."""
+        if self.direction is Direction.LEFT or self.direction is Direction.RIGHT:
+            return -self.direction.value.value, 0
+        return 0, -self.direction.value
 
     def __iter__(self):
         return iter((self.direction, self.entity))